@@ -1,4 +1,4 @@
-from utility.main import check, every_line, hrange, pret, show
+from utility.main import check, every_line, every_line_parallel, hrange, parse_args, pret, show, sum_
 
 
 def is_digit_at_point(line, idx):
@@ -95,12 +95,10 @@ check(calculate_line("pqr3stu8vwx"), 38)
 check(calculate_line("1abc"), 11)
 
 def calculate(filename):
-    values = []
-    with open(filename) as f:
-        for line in f:
-            values.append(calculate_line(line))
-    return add_calibration_values(values)
-
-check(pret("Trial result: ", calculate("trial_2.txt")), 281)
-pret("Real result: ", calculate("input.txt"))
+    return every_line_parallel(0, filename, calculate_line, sum_)
+
+if __name__ == "__main__":
+    parse_args()
+    check(pret("Trial result: ", calculate("trial_2.txt")), 281)
+    pret("Real result: ", calculate("input.txt"))
 
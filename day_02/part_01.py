@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
 import re
 
-from utility.main import check, every_line, show
+from utility.main import check, every_line, parse_args, pret, show
 
 @dataclass
 class Round:
@@ -86,8 +86,10 @@ def parse_line(state, line, _idx):
 def calculate(filename):
     state = State(Round(14, 12, 13))
     every_line(state, filename, [parse_line])
-    print(sum_possible_game_ids(state))
+    return sum_possible_game_ids(state)
 
-calculate("trial.txt")
-calculate("input.txt")
+if __name__ == "__main__":
+    parse_args()
+    pret("Trial:", calculate("trial.txt"))
+    pret("Input:", calculate("input.txt"))
 
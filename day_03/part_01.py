@@ -2,7 +2,8 @@
 from dataclasses import dataclass, field
 import re
 
-from utility.main import check, every_line, hrange, pret, show
+from utility.main import check, debug_only, every_line, hrange, parse_args, pret, show
+from utility.render import render
 
 
 @dataclass(frozen=True)
@@ -52,21 +53,15 @@ class State:
     valid_part_numbers: set[GridNumber] = field(default_factory=set)
     cells_to_grid_numbers: dict[Coord, GridNumber] = field(default_factory=dict)
 
+    @debug_only
     def viz(self):
         show("", True)
-        grid = []
-        for y in range(0, 10):
-            row = []
-            for x in range(0, 10):
-                if Coord(x, y) in self.cells_to_grid_numbers:
-                    row.append("1")
-                elif Coord(x, y) in {s.coord for s in self.grid_symbols}:
-                    row.append("*")
-                else:
-                    row.append(".")
-            grid.append("".join(row))
+        grid = render(10, 10, [
+            (self.cells_to_grid_numbers, "1"),
+            ([s.coord for s in self.grid_symbols], "*"),
+        ])
         show(", ".join(str(g.number) for g in self.valid_part_numbers))
-        show("\n".join(grid))
+        show(grid)
 
     def get_valid_part_numbers(self):
         for symbol in self.grid_symbols:
@@ -109,5 +104,7 @@ def calculate(filename):
     state.viz()
     return state.sum_part_numbers()
 
-# pret("Result:", calculate("trial.txt"))
-pret("Result:", calculate("input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    # pret("Result:", calculate("trial.txt"))
+    pret("Result:", calculate("input.txt"))
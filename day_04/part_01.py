@@ -2,7 +2,7 @@
 from dataclasses import dataclass, field
 import re
 
-from utility.main import check, every_line, pret
+from utility.main import check, every_line, parse_args, pret
 
 @dataclass
 class Game:
@@ -50,5 +50,7 @@ def calculate(filename):
     state = every_line(state, filename, [parse_line])
     return state.calculate_total_scores()
 
-pret("Result", calculate("trial.txt"))
-pret("Result", calculate("input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    pret("Result", calculate("trial.txt"))
+    pret("Result", calculate("input.txt"))
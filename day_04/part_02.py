@@ -2,7 +2,7 @@
 from dataclasses import dataclass, field
 import re
 
-from utility.main import check, every_line, hrange, pret
+from utility.main import check, every_line, hrange, parse_args, pret
 
 @dataclass
 class Game:
@@ -79,5 +79,7 @@ def calculate(filename):
     state = every_line(state, filename, [parse_line])
     return state.calculate_total_cards()
 
-pret("Result", calculate("trial.txt"))
-pret("Result", calculate("input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    pret("Result", calculate("trial.txt"))
+    pret("Result", calculate("input.txt"))
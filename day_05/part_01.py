@@ -1,4 +1,4 @@
-from utility.main import check, pret, show
+from utility.main import check, every_line, parse_args, pret, show
 from dataclasses import dataclass, field
 
 @dataclass
@@ -95,7 +95,29 @@ def compute(seeds, translations):
         for seed in seeds
     ])
 
-pret("Seeds:", compute(trial_seeds, trial_translations))
+@dataclass
+class State:
+    seeds: list[int] = field(default_factory=list)
+    translations: list[Translation] = field(default_factory=list)
+
+def parse_line(state: State, line: str, _idx: int) -> State:
+    if line.startswith("seeds:"):
+        state.seeds = [int(n) for n in line.split()[1:]]
+    elif line.endswith("map:"):
+        frm, to = line.split()[0].split("-to-")
+        state.translations.append(Translation(frm, to))
+    elif line != "":
+        state.translations[-1].adjusters.append(Adjuster(*[int(n) for n in line.split()]))
+    return state
+
+def calculate(filename):
+    state = every_line(State(), filename, [parse_line])
+    return compute(state.seeds, state.translations)
+
+if __name__ == "__main__":
+    parse_args()
+    pret("Seeds:", compute(trial_seeds, trial_translations))
+    pret("Trial:", calculate("trial.txt"))
 
 input_seeds = [432986705, 28073546, 1364097901, 88338513, 2733524843, 234912494, 3151642679, 224376393, 485709676, 344068331, 1560394266, 911616092, 3819746175, 87998136, 892394515, 435690182, 4218056486, 23868437, 848725444, 8940450]
 
@@ -360,4 +382,5 @@ Translation("humidity", "location", [
 ]),
 ]
 
-pret("Result:", compute(input_seeds, input_translations))
+if __name__ == "__main__":
+    pret("Result:", compute(input_seeds, input_translations))
@@ -1,4 +1,5 @@
-from utility.main import check, pret, show, hrange
+from utility.checkpoint import Checkpoint
+from utility.main import check, every_line, parse_args, pret, show, hrange
 from dataclasses import dataclass, field
 
 @dataclass
@@ -93,14 +94,16 @@ def is_seed(seed, valid_seeds):
             return True
     return False
 
-def find_lowest_seed(seeds, translations):
-    candidate = 0
+def find_lowest_seed(seeds, translations, saved: Checkpoint[int] | None = None):
+    candidate = saved.resume(0) if saved else 0
     while True:
         show(f"Trying: {candidate}")
         translated = translate_seed_backwards(candidate, translations)
         if is_seed(translated, seeds):
             return candidate
         candidate += 1
+        if saved:
+            saved.tick(candidate)
 
 check(len(expand_seeds([79, 14, 55, 13])), 27)
 check(is_seed(79, [79, 14, 55, 13]), True)
@@ -145,7 +148,30 @@ trial_translations = [
 
 check(translate_seed(79, trial_translations), 82)
 check(translate_seed_backwards(82, trial_translations), 79)
-pret("Trial result:", find_lowest_seed(trial_seeds, trial_translations))
+
+@dataclass
+class State:
+    seeds: list[int] = field(default_factory=list)
+    translations: list[Translation] = field(default_factory=list)
+
+def parse_line(state: State, line: str, _idx: int) -> State:
+    if line.startswith("seeds:"):
+        state.seeds = [int(n) for n in line.split()[1:]]
+    elif line.endswith("map:"):
+        frm, to = line.split()[0].split("-to-")
+        state.translations.append(Translation(frm, to))
+    elif line != "":
+        state.translations[-1].adjusters.append(Adjuster(*[int(n) for n in line.split()]))
+    return state
+
+def calculate(filename):
+    state = every_line(State(), filename, [parse_line])
+    with Checkpoint("day_05/part_02 lowest seed", filename, __name__) as saved:
+        return find_lowest_seed(state.seeds, state.translations, saved)
+
+if __name__ == "__main__":
+    parse_args()
+    pret("Trial result:", calculate("trial.txt"))
 
 def translate_seeds(seeds, translations):
     return [
@@ -423,8 +449,11 @@ Translation("humidity", "location", [
 ]),
 ]
 
-# show(len(expand_seeds(input_seeds)))
-# pret("Result:", compute(input_seeds, input_translations))
-pret("Input result:", find_lowest_seed(input_seeds, input_translations))
+if __name__ == "__main__":
+    # show(len(expand_seeds(input_seeds)))
+    # pret("Result:", compute(input_seeds, input_translations))
+    # The input is pasted in above, so its checkpoint is keyed by this file
+    with Checkpoint("day_05/part_02 lowest seed", __file__, __name__) as saved:
+        pret("Input result:", find_lowest_seed(input_seeds, input_translations, saved))
 
 # Got half way through implementing bisect and then it completed XD
@@ -1,7 +1,7 @@
 from collections import defaultdict
 from dataclasses import dataclass, field
 
-from utility.main import check, every_line, pret
+from utility.main import check, every_line, parse_args, pret
 
 
 @dataclass
@@ -115,6 +115,8 @@ def compute(filename):
     my_state = every_line(my_state, filename, [parse_line])
     return my_state.score()
 
-pret("Trial result:", compute("trial.txt"))
-pret("Input result:", compute("input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    pret("Trial result:", compute("trial.txt"))
+    pret("Input result:", compute("input.txt"))
 
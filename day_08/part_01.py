@@ -2,7 +2,7 @@ from dataclasses import dataclass
 import re
 from typing import Self
 
-from utility.main import check, every_line, pret, show, tlog
+from utility.main import check, every_line_bulk, parse_args, pret, read_lines, show, tlog
 
 
 @dataclass
@@ -43,10 +43,10 @@ class State:
         if self.current is None or self.oscillator is None:
             raise Exception("Class not set up")
         if self.oscillator.current() == "R":
-            tlog(1, f"{self.current.name}:R -> {self.current.right.name}")
+            tlog(1, "{}:R -> {}", self.current.name, self.current.right.name)
             self.current = self.current.right
         elif self.oscillator.current() == "L":
-            tlog(1, f"{self.current.name}:L -> {self.current.right.name}")
+            tlog(1, "{}:L -> {}", self.current.name, self.current.right.name)
             self.current = self.current.left
         else:
             raise Exception(f"Bad direction '{self.oscillator.current()}'")
@@ -108,15 +108,18 @@ def parse_line(state, line, idx):
 
 def compute(filename):
     cell_dict = {}
-    cell_dict = every_line(cell_dict, filename, [parse_line_for_cell_dict])
+    lines = read_lines(filename)
+    cell_dict = every_line_bulk(cell_dict, lines, [parse_line_for_cell_dict])
     state = State()
     state.cell_dict = cell_dict
     state.start = state.current = state.cell_dict["AAA"]
     state.end = state.cell_dict["ZZZ"]
-    state = every_line(state, filename, [parse_line])
+    state = every_line_bulk(state, lines, [parse_line])
     return state.steps_to_end()
 
 
-pret("Trial result:", compute("trial.txt"))
-pret("Trial 2 result:", compute("trial_2.txt"))
-pret("Input result:", compute("input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    pret("Trial result:", compute("trial.txt"))
+    pret("Trial 2 result:", compute("trial_2.txt"))
+    pret("Input result:", compute("input.txt"))
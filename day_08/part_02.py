@@ -4,7 +4,7 @@ import math
 import re
 from typing import Self
 
-from utility.main import check, every_line, pret, show, tlog
+from utility.main import check, every_line_bulk, parse_args, pret, read_lines, show, tlog
 
 
 @dataclass
@@ -74,7 +74,7 @@ class State:
                         head.skip = skip_data[0]
                     elif head.recording() and head.last_z_steps is not None and head.last_z_cell is not None:
                         skip_length = steps - head.last_z_steps
-                        tlog(1, f"New skip found at {steps}: {head.last_z_cell.name}:{self.oscillator.idx} -{skip_length}-> {head.current.name}")
+                        tlog(1, "New skip found at {}: {}:{} -{}-> {}", steps, head.last_z_cell.name, self.oscillator.idx, skip_length, head.current.name)
                         self.skips[(head.last_z_cell.name, self.oscillator.idx)] = (skip_length, head.current)
                         head.last_z_cell = head.current
                         head.last_z_steps = steps
@@ -126,15 +126,18 @@ def parse_line(state, line, idx):
 
 def compute(filename):
     cell_dict = {}
-    cell_dict = every_line(cell_dict, filename, [parse_line_for_cell_dict])
+    lines = read_lines(filename)
+    cell_dict = every_line_bulk(cell_dict, lines, [parse_line_for_cell_dict])
     state = State()
     state.cell_dict = cell_dict
-    state = every_line(state, filename, [parse_line])
+    state = every_line_bulk(state, lines, [parse_line])
     return state.steps_to_end()
 
 
-# pret("Trial 2 result:", compute("trial_2.txt"))
-pret("Input result:", compute("input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    # pret("Trial 2 result:", compute("trial_2.txt"))
+    pret("Input result:", compute("input.txt"))
 
 # Not 35425771156910852049249195 -- too high
 # Not 515051047497674924930031 -- too high
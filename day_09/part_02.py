@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 
-from utility.main import check, every_line, hrange, pret
+from utility.main import check, every_line, hrange, parse_args, pret
 
 @dataclass
 class Sequence:
@@ -59,5 +59,7 @@ def calculate(filename):
     every_line(state, filename, [parse_line])
     return state.sum_extrapolates_back()
 
-pret("Trial:", calculate("trial.txt"))
-pret("Input:", calculate("input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    pret("Trial:", calculate("trial.txt"))
+    pret("Input:", calculate("input.txt"))
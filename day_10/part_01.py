@@ -1,31 +1,8 @@
 from dataclasses import dataclass, field
 
-from utility.main import every_line, pret, show
-
-@dataclass(frozen=True)
-class Vec:
-    x: int
-    y: int
-
-    def add(self, vec):
-        return Vec(self.x + vec.x, self.y + vec.y)
-
-@dataclass
-class Cell:
-    pos: Vec
-    type: str
-
-@dataclass
-class Grid:
-    location_to_cell: dict[Vec, Cell] = field(default_factory=dict)
-
-    def get_type(self, pos: Vec) -> str:
-        if pos not in self.location_to_cell:
-            return "."
-        return self.location_to_cell[pos].type
-
-    def add(self, cell: Cell):
-        self.location_to_cell[cell.pos] = cell
+from utility.grid import Grid
+from utility.main import every_line, parse_args, pret, show
+from utility.vec import Vec
 
 @dataclass
 class Searcher:
@@ -42,16 +19,23 @@ class Searcher:
 
 @dataclass
 class State:
-    grid: Grid = field(default_factory=Grid)
+    grid: Grid = field(default_factory=lambda: Grid(0, 0))
+    rows: list[str] = field(default_factory=list)
     searcher_a: Searcher = field(default_factory=Searcher)
     searcher_b: Searcher = field(default_factory=Searcher)
     lookup: dict[tuple[Vec, str], Vec] = field(default_factory=dict)
-    start_cell: Cell | None = None
+    start: Vec | None = None
+
+    def get_type(self, pos: Vec) -> str:
+        if not self.grid.in_bounds(pos.x, pos.y):
+            return "."
+        return self.grid[self.grid.idx(pos.x, pos.y)]
 
     def tick(self, searcher: Searcher):
-        searcher.move(State.lookup[searcher.last_movement, self.grid.get_type(searcher.pos)])
+        searcher.move(State.lookup[searcher.last_movement, self.get_type(searcher.pos)])
 
     def find_midpoint(self):
+        self.grid = Grid.from_lines(self.rows)
         self.setup_searchers()
         while self.searcher_a.pos != self.searcher_b.pos:
             self.tick(self.searcher_a)
@@ -62,26 +46,26 @@ class State:
 
     def setup_searchers(self):
         directions = []
-        if self.start_cell is None:
+        if self.start is None:
             raise Exception("No start cell!")
-        pos = self.start_cell.pos
-        if self.grid.get_type(pos.add(Vec(0, -1))) in ["|", "F", "7"]:
+        pos = self.start
+        if self.get_type(pos.add(Vec(0, -1))) in ["|", "F", "7"]:
             directions.append(Vec(0, -1))
-        if self.grid.get_type(pos.add(Vec(0, 1))) in ["|", "J", "L"]:
+        if self.get_type(pos.add(Vec(0, 1))) in ["|", "J", "L"]:
             directions.append(Vec(0, 1))
-        if self.grid.get_type(pos.add(Vec(1, 0))) in ["-", "7", "J"]:
+        if self.get_type(pos.add(Vec(1, 0))) in ["-", "7", "J"]:
             directions.append(Vec(1, 0))
-        if self.grid.get_type(pos.add(Vec(-1, 0))) in ["-", "F", "L"]:
+        if self.get_type(pos.add(Vec(-1, 0))) in ["-", "F", "L"]:
             directions.append(Vec(-1, 0))
         if len(directions) != 2:
             raise Exception(f"Wrong number of directions! {directions}")
-        self.searcher_a.pos = self.start_cell.pos
-        self.searcher_b.pos = self.start_cell.pos
+        self.searcher_a.pos = self.start
+        self.searcher_b.pos = self.start
         self.searcher_a.move(directions[0])
         self.searcher_b.move(directions[1])
 
     def viz(self):
-        # show(str(self.grid.location_to_cell))
+        # show(str(self.grid))
         pass
 
 State.lookup = {
@@ -105,11 +89,9 @@ State.lookup = {
 }
 
 def parse_line(state: State, line: str, y):
-    for x, type in enumerate(line):
-        cell = Cell(Vec(x, y), type)
-        state.grid.add(Cell(Vec(x, y), type))
-        if type == "S":
-            state.start_cell = cell
+    state.rows.append(line)
+    if "S" in line:
+        state.start = Vec(line.index("S"), y)
     return state
 
 def calculate(filename):
@@ -117,5 +99,7 @@ def calculate(filename):
     every_line(state, filename, [parse_line])
     return state.find_midpoint()
 
-pret("Trial: ", calculate("trial.txt"))
-pret("Input: ", calculate("input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    pret("Trial: ", calculate("trial.txt"))
+    pret("Input: ", calculate("input.txt"))
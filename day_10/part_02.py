@@ -1,31 +1,9 @@
 from dataclasses import dataclass, field
 
-from utility.main import every_line, hrange, imagify, pret, show
-
-@dataclass(frozen=True)
-class Vec:
-    x: int
-    y: int
-
-    def add(self, vec):
-        return Vec(self.x + vec.x, self.y + vec.y)
-
-@dataclass
-class Cell:
-    pos: Vec
-    type: str
-
-@dataclass
-class Grid:
-    location_to_cell: dict[Vec, Cell] = field(default_factory=dict)
-
-    def get_type(self, pos: Vec) -> str:
-        if pos not in self.location_to_cell:
-            return "."
-        return self.location_to_cell[pos].type
-
-    def add(self, cell: Cell):
-        self.location_to_cell[cell.pos] = cell
+from utility.grid import Grid
+from utility.main import debug_only, every_line, hrange, imagify, parse_args, pret, show
+from utility.render import render
+from utility.vec import Vec
 
 @dataclass
 class Searcher:
@@ -44,21 +22,28 @@ class Searcher:
 
 @dataclass
 class State:
-    grid: Grid = field(default_factory=Grid)
+    grid: Grid = field(default_factory=lambda: Grid(0, 0))
+    rows: list[str] = field(default_factory=list)
     searcher_a: Searcher = field(default_factory=Searcher)
     searcher_b: Searcher = field(default_factory=Searcher)
     lookup: dict[tuple[Vec, str], Vec] = field(default_factory=dict)
-    start_cell: Cell | None = None
+    start: Vec | None = None
     lookup_shape: dict[frozenset[Vec], str] = field(default_factory=dict)
     outline_pos: set[Vec] = field(default_factory=set)
     width: int = 0
     height: int = 0
     insides: set[Vec] = field(default_factory=set)
 
+    def get_type(self, pos: Vec) -> str:
+        if not self.grid.in_bounds(pos.x, pos.y):
+            return "."
+        return self.grid[self.grid.idx(pos.x, pos.y)]
+
     def tick(self, searcher: Searcher):
-        searcher.move(State.lookup[searcher.last_movement, self.grid.get_type(searcher.pos)])
+        searcher.move(State.lookup[searcher.last_movement, self.get_type(searcher.pos)])
 
     def find_midpoint(self):
+        self.grid = Grid.from_lines(self.rows)
         self.setup_searchers()
         while self.searcher_a.pos != self.searcher_b.pos:
             self.tick(self.searcher_a)
@@ -69,30 +54,30 @@ class State:
 
     def setup_searchers(self):
         directions: list[Vec] = []
-        if self.start_cell is None:
+        if self.start is None:
             raise Exception("No start cell!")
-        pos = self.start_cell.pos
-        if self.grid.get_type(pos.add(Vec(0, -1))) in ["|", "F", "7"]:
+        pos = self.start
+        if self.get_type(pos.add(Vec(0, -1))) in ["|", "F", "7"]:
             directions.append(Vec(0, -1))
-        if self.grid.get_type(pos.add(Vec(0, 1))) in ["|", "J", "L"]:
+        if self.get_type(pos.add(Vec(0, 1))) in ["|", "J", "L"]:
             directions.append(Vec(0, 1))
-        if self.grid.get_type(pos.add(Vec(1, 0))) in ["-", "7", "J"]:
+        if self.get_type(pos.add(Vec(1, 0))) in ["-", "7", "J"]:
             directions.append(Vec(1, 0))
-        if self.grid.get_type(pos.add(Vec(-1, 0))) in ["-", "F", "L"]:
+        if self.get_type(pos.add(Vec(-1, 0))) in ["-", "F", "L"]:
             directions.append(Vec(-1, 0))
         if len(directions) != 2:
             raise Exception(f"Wrong number of directions! {directions}")
-        self.start_cell.type = State.lookup_shape[frozenset(directions)]
-        self.searcher_a.pos = self.start_cell.pos
-        self.searcher_b.pos = self.start_cell.pos
+        self.grid[self.grid.idx(pos.x, pos.y)] = State.lookup_shape[frozenset(directions)]
+        self.searcher_a.pos = self.start
+        self.searcher_b.pos = self.start
         self.searcher_a.move(directions[0])
         self.searcher_b.move(directions[1])
 
     def populate_outline_cells(self):
         self.outline_pos = self.searcher_a.visited.union(self.searcher_b.visited)
-        if self.start_cell is None:
+        if self.start is None:
             raise Exception("No!")
-        self.outline_pos.add(self.start_cell.pos)
+        self.outline_pos.add(self.start)
 
     def count_inside_cells(self):
         count = 0
@@ -101,7 +86,7 @@ class State:
             for x in hrange(0, self.width - 1, self.width):
                 pos = Vec(x, y)
                 if pos in self.outline_pos:
-                    if self.grid.get_type(pos) in "|LJ":
+                    if self.get_type(pos) in "|LJ":
                         if ray_state == "OUTSIDE":
                             ray_state = "INSIDE"
                         else:
@@ -112,22 +97,15 @@ class State:
                         self.insides.add(pos)
         return count
 
+    @debug_only
     def viz(self):
-        grid = []
-        for y in hrange(0, self.height - 1, self.height):
-            row = []
-            for x in hrange(0, self.width - 1, self.width):
-                pos = Vec(x, y)
-                if self.grid.get_type(pos) == "S":
-                    row.append("Y")
-                elif pos in self.insides:
-                    row.append("G")
-                elif pos in self.outline_pos:
-                    row.append("#")
-                else:
-                    row.append(".")
-            grid.append(row)
-        imagify("viz.png", grid, scale=5)
+        starts = [Vec(*self.grid.xy(idx)) for idx in self.grid.find_all("S")]
+        grid = render(self.width, self.height, [
+            (starts, "Y"),
+            (self.insides, "G"),
+            (self.outline_pos, "#"),
+        ])
+        imagify("viz.png", grid.split("\n"), scale=5)
 
 State.lookup = {
     (Vec(1, 0),  "-"): Vec(1, 0),
@@ -159,11 +137,9 @@ State.lookup_shape = {
 }
 
 def parse_line(state: State, line: str, y):
-    for x, type in enumerate(line):
-        cell = Cell(Vec(x, y), type)
-        state.grid.add(cell)
-        if type == "S":
-            state.start_cell = cell
+    state.rows.append(line)
+    if "S" in line:
+        state.start = Vec(line.index("S"), y)
     state.height = y + 1
     state.width = len(line)
     return state
@@ -177,5 +153,7 @@ def calculate(filename):
     state.viz()
     return res
 
-# pret("Trial2: ", calculate("trial_2.txt"))
-pret("Input: ", calculate("input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    # pret("Trial2: ", calculate("trial_2.txt"))
+    pret("Input: ", calculate("input.txt"))
@@ -1,19 +1,9 @@
 from dataclasses import dataclass, field
 
-from utility.main import check, every_line, hrange, pret
+from utility.main import check, every_line, hrange, parse_args, pret
+from utility.vec import Vec
 
 
-@dataclass(frozen=True)
-class Vec:
-    x: int
-    y: int
-
-    def add(self, other):
-        return Vec(self.x + other.x, self.y + other.y)
-
-    def mdist(self, other):
-        return abs(self.x - other.x) + abs(self.y - other.y)
-
 check(Vec(4, 0).mdist(Vec(9, 10)), 15)
 check(Vec(9, 10).mdist(Vec(4, 0)), 15)
 
@@ -95,5 +85,7 @@ def calculate(filename):
             state.space.x_gaps.append(x)
     return state.sum_distances()
 
-pret("Trial:", calculate("trial.txt"))
-pret("Input:", calculate("input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    pret("Trial:", calculate("trial.txt"))
+    pret("Input:", calculate("input.txt"))
@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
 import time
 
-from utility.main import check, every_line, hrange, pret
+from utility.main import check, every_line_parallel, hrange, parse_args, pret, sum_
 
 # ???#??.?#??.?
 
@@ -89,18 +89,25 @@ class State:
 # #....######..#####. 1,6,5
 # .###.##....# 3,2,1
 
-def parse_line(state, line, _idx):
+def parse_record(line):
     halves = line.split(" ")
     pattern = halves[0]
     numbers = [int(numstr) for numstr in halves[1].split(",")]
-    state.records.append(Record(pattern, numbers))
+    return Record(pattern, numbers)
+
+def parse_line(state, line, _idx):
+    state.records.append(parse_record(line))
     return state
 
+# Records don't depend on each other, so count them across processes
+def count_line(line):
+    return parse_record(line).count_possibles()
+
 def calculate(filename):
-    state = State()
-    every_line(state, filename, [parse_line])
-    return state.sum_counts()
+    return every_line_parallel(0, filename, count_line, sum_)
 
-pret("Trial: ", calculate("trial.txt"))
-pret("Input: ", calculate("input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    pret("Trial: ", calculate("trial.txt"))
+    pret("Input: ", calculate("input.txt"))
 # 8465 - too high
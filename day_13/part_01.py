@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
 from math import floor
 
-from utility.main import every_line, hrange, pret, show, tlog
+from utility.main import debug_only, every_line, hrange, parse_args, pret, show, tlog
 
 
 @dataclass(frozen=True)
@@ -59,6 +59,7 @@ class Area:
         self.cols[n] = col
         return col
 
+    @debug_only
     def viz(self):
         grid = []
         for y in range(0, self.height):
@@ -110,5 +111,7 @@ def calculate(filename):
     # return [(area.width, area.height) for area in state.areas]
     return state.summarize()
 
-pret("Trial:", calculate("trial.txt"))
-pret("Input:", calculate("input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    pret("Trial:", calculate("trial.txt"))
+    pret("Input:", calculate("input.txt"))
@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from math import ceil, floor
 from tabnanny import check
 
-from utility.main import every_line, hrange, pret, show, tlog
+from utility.main import debug_only, every_line, hrange, parse_args, pret, show, tlog
 
 
 @dataclass(frozen=True)
@@ -129,6 +129,7 @@ class Area:
         self.cols[n] = col
         return col
 
+    @debug_only
     def viz(self):
         grid = ["   01234567890"]
         for y in range(0, self.height):
@@ -183,5 +184,7 @@ def calculate(filename):
         state.area_started = 0
     return state.summarize_new()
 
-pret("Trial:", calculate("trial.txt"))
-pret("Input:", calculate("input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    pret("Trial:", calculate("trial.txt"))
+    pret("Input:", calculate("input.txt"))
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from utility.main import check, pret, every_line
+from utility.main import check, parse_args, pret, every_line
 
 @dataclass
 class Span:
@@ -63,5 +63,7 @@ def calculate(filename):
     every_line(state, filename, [parse_line])
     return state.calculate()
 
-pret("Trial:", calculate("trial.txt"))
-pret("Input:", calculate("input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    pret("Trial:", calculate("trial.txt"))
+    pret("Input:", calculate("input.txt"))
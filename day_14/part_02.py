@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 from time import sleep
-from utility.main import check, pret, every_line, show
+from utility.main import check, debug_only, every_line, parse_args, pret, show
 
 @dataclass
 class Span:
@@ -189,6 +189,7 @@ class State:
     def calculate(self):
         return sum(col.calculate() for col in self.pipes.values())
 
+    @debug_only
     def viz(self, label, rotate = False, fliph = False, flipv = False):
         grid = []
         for rown in range(0, self.pipes[0].room_length):
@@ -225,5 +226,7 @@ def calculate(filename):
         state.cycle()
         # sleep(0.1)
 
-# pret("Trial:", calculate("trial.txt"))
-pret("Input:", calculate("input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    # pret("Trial:", calculate("trial.txt"))
+    pret("Input:", calculate("input.txt"))
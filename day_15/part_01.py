@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 import re
 
-from utility.main import check, every_line, pret
+from utility.main import check, every_line, parse_args, pret
 
 
 @dataclass
@@ -34,5 +34,7 @@ def calculate(filename):
     every_line(state, filename, [parse_line])
     return state.sum_sequences()
 
-pret("Trial:", calculate("trial.txt"))
-pret("Input:", calculate("input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    pret("Trial:", calculate("trial.txt"))
+    pret("Input:", calculate("input.txt"))
@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
 import re
 
-from utility.main import check, every_line, pret
+from utility.main import check, every_line, parse_args, pret
 
 def calc_hash(chunk: str):
     val = 0
@@ -135,5 +135,7 @@ def calculate(filename):
     state.execute_instructions()
     return state.calc_focusing_power()
 
-pret("Trial:", calculate("trial.txt"))
-pret("Input:", calculate("input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    pret("Trial:", calculate("trial.txt"))
+    pret("Input:", calculate("input.txt"))
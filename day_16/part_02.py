@@ -1,17 +1,11 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from time import sleep
 
-from utility.main import check, every_line, pret, show
+from utility.grid import DOWN, LEFT, RIGHT, UP, Grid
+from utility.main import check, debug_only, parse_args, pret, show
+from utility.vec import Vec
 
 
-@dataclass(frozen=True)
-class Vec:
-    x: int
-    y: int
-
-    def add(self, other):
-        return Vec(self.x + other.x, self.y + other.y)
-
 GOING_RIGHT = Vec(1, 0)
 GOING_LEFT = Vec(-1, 0)
 GOING_UP = Vec(0, -1)
@@ -144,81 +138,65 @@ check(d.divert(Beam(d.pos, GOING_RIGHT)), {
 
 type Diverter = DiverterBackslash | DiverterForwardslash | DiverterHyphen | DiverterPipe
 
-@dataclass
-class State:
-    start_beam: Beam = field(default=Beam(Vec(0, 0), GOING_RIGHT))
-    beams: set[Beam] = field(default_factory=set)
-    seen_beams: set[Beam] = field(default_factory=set)
-    visited: set[Vec] = field(default_factory=set)
-    diverters: dict[Vec, Diverter] = field(default_factory=dict)
-    width: int = 0
-    height: int = 0
-
-    def process(self):
-        self.beams.add(self.start_beam)
-        while len(self.beams) > 0:
-            beam = self.beams.pop()
-            self.seen_beams.add(beam)
-            if self.off_screen(beam.pos):
-                continue
-            new_beams = set()
-            self.visited.add(beam.pos)
-            if beam.pos in self.diverters:
-                diverter = self.diverters[beam.pos]
-                new_beams.update(diverter.divert(beam))
-            else:
-                new_beams.add(Beam(beam.pos.add(beam.direction), beam.direction))
-            novel_beams = set()
-            for beam in new_beams:
-                if beam not in self.seen_beams:
-                    novel_beams.add(beam)
-            self.beams.update(novel_beams)
-
-    def viz(self):
-        grid = []
-        for y in range(0, self.height):
-            row = []
-            for x in range(0, self.width):
-                pos = Vec(x, y)
-                if pos in (beam.pos for beam in self.beams):
-                    row.append("*")
-                elif pos in self.diverters:
-                    row.append(str(self.diverters[pos]))
-                elif pos in self.visited:
-                    row.append("#")
-                else:
-                    row.append(".")
-            grid.append("".join(row))
-        show("\n".join(grid), clear=True)
-
-    def off_screen(self, pos):
-        if pos.x >= self.width:
-            return True
-        elif pos.x < 0:
-            return True
-        elif pos.y >= self.height:
-            return True
-        elif pos.y < 0:
-            return True
-        return False
-
-    def reset(self):
-        self.start_beam = Beam(Vec(0, 0), GOING_RIGHT)
-        self.beams = set()
-        self.seen_beams = set()
-        self.visited = set()
-
-my_state = State()
-my_state.width = 5
-my_state.height = 10
-check(my_state.off_screen(Vec(-1, 0)), True)
-check(my_state.off_screen(Vec(0, -1)), True)
-check(my_state.off_screen(Vec(0, 0)), False)
-check(my_state.off_screen(Vec(1, 0)), False)
-check(my_state.off_screen(Vec(2, 0)), False)
-check(my_state.off_screen(Vec(3, 0)), False)
-check(my_state.off_screen(Vec(4, 0)), False)
-check(my_state.off_screen(Vec(5, 0)), True)
+# == Energising ==
+# The beam walk runs on a Grid with plain int cells and directions. Where a
+# beam goes next from each kind of cell is worked out once, from the
+# diverters above: BENDS[cell][direction] -> directions out.
+
+GOINGS = [GOING_RIGHT, GOING_DOWN, GOING_LEFT, GOING_UP]
+DIVERTERS = {
+    "/": DiverterForwardslash,
+    "\\": DiverterBackslash,
+    "-": DiverterHyphen,
+    "|": DiverterPipe,
+}
+
+def bends(char: str) -> list[list[int]]:
+    if char not in DIVERTERS:
+        return [[direction] for direction in range(len(GOINGS))]
+    diverter = DIVERTERS[char](Vec(0, 0))
+    return [
+        [GOINGS.index(beam.direction) for beam in diverter.divert(Beam(diverter.pos, going))]
+        for going in GOINGS
+    ]
+
+BENDS = {ord(char): bends(char) for char in "./\\-|"}
+
+check(BENDS[ord(".")][RIGHT], [RIGHT])
+check(BENDS[ord("/")][RIGHT], [UP])
+check(sorted(BENDS[ord("|")][LEFT]), [DOWN, UP])
+
+def energised(grid: Grid, start: int, direction: int) -> bytearray:
+    # One bit per direction a beam has already passed through each cell
+    seen = bytearray(len(grid))
+    beams = [(start, direction)]
+    while beams:
+        idx, direction = beams.pop()
+        if seen[idx] & (1 << direction):
+            continue
+        seen[idx] |= 1 << direction
+        for going in BENDS[grid.cells[idx]][direction]:
+            moved = grid.step(idx, going)
+            if moved >= 0:
+                beams.append((moved, going))
+    return seen
+
+def energise(grid: Grid, start: int, direction: int) -> int:
+    seen = energised(grid, start, direction)
+    return len(seen) - seen.count(0)
+
+@debug_only
+def viz(grid: Grid, seen: bytearray):
+    # Diverters as they are, energised cells as #
+    show("\n".join(
+        "".join(
+            grid[idx] if grid[idx] != "." else "#" if seen[idx] else "."
+            for idx in range(y * grid.width, (y + 1) * grid.width)
+        )
+        for y in range(grid.height)
+    ), clear=True)
+
+check(energise(Grid.from_lines([".|.", "...", "..."]), 0, RIGHT), 4)
 
 def possible_beams(width: int, height: int):
     for y in range(0, height):
@@ -243,32 +221,15 @@ check(set(possible_beams(3, 3)), {
     Beam(Vec(2, 0), GOING_LEFT),
 })
 
-def parse_line(state: State, line: str, y: int) -> State:
-    state.height = y + 1
-    state.width = len(line)
-    for x, char in enumerate(line):
-        pos = Vec(x, y)
-        if char == "/":
-            state.diverters[pos] = DiverterForwardslash(pos)
-        elif char == "\\":
-            state.diverters[pos] = DiverterBackslash(pos)
-        elif char == "-":
-            state.diverters[pos] = DiverterHyphen(pos)
-        elif char == "|":
-            state.diverters[pos] = DiverterPipe(pos)
-    return state
-
 def calculate(filename):
-    state = State()
-    state = every_line(state, filename, [parse_line])
-    state.viz()
-    max_tiles = 0
-    for beam in possible_beams(state.width, state.height):
-        state.reset()
-        state.start_beam = beam
-        state.process()
-        max_tiles = max(len(state.visited), max_tiles)
-    return max_tiles
-
-pret("Trial", calculate("trial.txt"))
-pret("Input", calculate("input.txt"))
+    grid = Grid.from_file(filename)
+    return max(
+        energise(grid, grid.idx(beam.pos.x, beam.pos.y), GOINGS.index(beam.direction))
+        for beam in possible_beams(grid.width, grid.height)
+    )
+    # viz(grid, energised(grid, 0, RIGHT))
+
+if __name__ == "__main__":
+    parse_args()
+    pret("Trial", calculate("trial.txt"))
+    pret("Input", calculate("input.txt"))
@@ -1,26 +1,27 @@
-from collections import defaultdict
+from array import array
 from dataclasses import dataclass, field
-from heapq import heappop, heappush
-import math
-from typing import Self
+from typing import Callable, Self
 
-from utility.main import check, every_line, pret, show
+from utility.grid import DOWN, LEFT, RIGHT, UP, Grid
+from utility.main import check, debug_only, every, every_line, parse_args, pret, show
+from utility.render import render
+from utility.search import INF, Dial, Search
+from utility.vec import Vec
 
 
-@dataclass(frozen=True, order=True)
-class Vec:
-    x: int
-    y: int
-
-    def add(self, other):
-        return Vec(self.x + other.x, self.y + other.y)
-
 GOING_RIGHT = Vec(1, 0)
 GOING_LEFT = Vec(-1, 0)
 GOING_UP = Vec(0, -1)
 GOING_DOWN = Vec(0, 1)
 VERTICALS = {GOING_UP, GOING_DOWN}
 HORIZONTALS = {GOING_LEFT, GOING_RIGHT}
+# In utility.grid's order, so turning is +1 / -1 mod 4
+DIRECTIONS = [GOING_RIGHT, GOING_DOWN, GOING_LEFT, GOING_UP]
+HORIZONTAL, VERTICAL = 0, 1
+AXES = [(RIGHT, LEFT), (DOWN, UP)]
+# Carts have gone 0 to 3 cells straight
+TRACKS = 4
+UNREACHABLE = 1 << 62
 
 @dataclass
 class Cell:
@@ -101,66 +102,144 @@ class State:
     width: int = 0
     height: int = 0
     best_path: list[Vec] = field(default_factory=list)
+    rows: list[str] = field(default_factory=list)
+    grid: Grid = field(default_factory=lambda: Grid(0, 0))
+    heat: list[int] = field(default_factory=list)
+
+    def find_path(self, field: array | None = None):
+        self.index_cells()
+        end = self.grid.idx(self.end.x, self.end.y)
+        to_end = [abs(self.end.x - x) + abs(self.end.y - y) for y in range(self.height) for x in range(self.width)]
+        heuristic = field.__getitem__ if field is not None else lambda state: to_end[state // (4 * TRACKS)]
+        search = Search(self.moves, heuristic=heuristic, size=len(self.heat) * 4 * TRACKS)
+        goal = search.run([self.pack(self.start)], lambda state: state // (4 * TRACKS) == end)
+        if goal is None:
+            raise Exception("Couldn't find path :(")
+        self.best_path = [self.unpack(state).pos for state in search.path(goal)]
+        return self.best_path
+
+    # == Segments ==
+    # A cart that has just turned goes least to most cells before turning
+    # again, so rather than stepping a cell at a time with a track count,
+    # search (cell, axis it goes along next) and take each whole straight run
+    # as one move. A run costs at most 9 * most, so utility.search.Dial's
+    # buckets stand in for the heap.
+
+    def least_heat(self, least: int, most: int, axes: list[int]) -> int:
+        self.index_cells()
+        start = self.grid.idx(self.start.pos.x, self.start.pos.y)
+        end = self.grid.idx(self.end.x, self.end.y)
+        search = Dial(self.segments(least, most), size=len(self.heat) * 2, most=9 * most)
+        goal = search.run([start * 2 + axis for axis in axes], lambda state: state // 2 == end)
+        if goal is None:
+            raise Exception("Couldn't find path :(")
+        self.best_path = self.cells_along(search.path(goal))
+        return search.cost(goal)
+
+    def segments(self, least: int, most: int) -> Callable[[int], list[tuple[int, int]]]:
+        grid, heat = self.grid, self.heat
+
+        def moves(state: int) -> list[tuple[int, int]]:
+            idx, axis = divmod(state, 2)
+            turned = 1 - axis
+            moves = []
+            for direction in AXES[axis]:
+                at, lost = idx, 0
+                for run in range(1, most + 1):
+                    at = grid.step(at, direction)
+                    if at == -1:
+                        break
+                    lost += heat[at]
+                    if run >= least:
+                        moves.append((at * 2 + turned, lost))
+            return moves
+
+        return moves
+
+    def cells_along(self, states: list[int]) -> list[Vec]:
+        path = [Vec(*self.grid.xy(states[0] // 2))]
+        for state in states[1:]:
+            x, y = self.grid.xy(state // 2)
+            while path[-1] != Vec(x, y):
+                last = path[-1]
+                path.append(Vec(last.x + (x > last.x) - (x < last.x), last.y + (y > last.y) - (y < last.y)))
+        return path
 
-    def find_path(self):
-        to_check: list[tuple[float, Cart]] = []
-        heappush(to_check, (self.start.hdist(self.end), self.start))
-        came_from: dict[Cart, Cart] = {}
-        g_score: dict[Cart, float] = defaultdict(lambda: math.inf)
-        g_score[self.start] = 0
-        f_score: dict[Cart, float] = defaultdict(lambda: math.inf)
-        f_score[self.start] = self.start.hdist(self.end)
-
-        while len(to_check) != 0:
-            _, current = heappop(to_check)
-            if current.pos == self.end:
-                self.best_path = self.reconstruct_path(came_from, current)
-                return self.best_path
-
-            for neighbour in current.neighbours():
-                if self.off_screen(neighbour.pos):
-                    continue
-
-                neighbour_cell = self.cells[neighbour.pos]
-                tentative_g_score = g_score[current] + neighbour_cell.heat_loss
-                if tentative_g_score < g_score[neighbour]:
-                    came_from[neighbour] = current
-                    g_score[neighbour] = tentative_g_score
-                    f_score[neighbour] = tentative_g_score + neighbour.hdist(self.end)
-                    if neighbour not in to_check:
-                        heappush(to_check, (f_score[neighbour], neighbour))
-
-        raise Exception("Couldn't find path :(")
-
-    def reconstruct_path(self, came_from: dict[Cart, Cart], current: Cart) -> list[Vec]:
-        total_path: list[Vec] = []
-        while current in came_from:
-            current = came_from[current]
-            total_path.append(current.pos)
-        return list(reversed(total_path))
+    # == Packed ==
+    # Search states are Carts packed into ints, see utility.search
+
+    def index_cells(self):
+        self.grid = Grid.from_lines(self.rows)
+        self.heat = [int(char) for char in "".join(self.rows)]
+
+    def pack(self, cart: Cart) -> int:
+        idx = self.grid.idx(cart.pos.x, cart.pos.y)
+        return (idx * 4 + DIRECTIONS.index(cart.direction)) * TRACKS + cart.track
+
+    def unpack(self, state: int) -> Cart:
+        rest, track = divmod(state, TRACKS)
+        idx, direction = divmod(rest, 4)
+        return Cart(Vec(*self.grid.xy(idx)), DIRECTIONS[direction], track)
+
+    def moves(self, state: int) -> list[tuple[int, int]]:
+        # Cart.neighbours on packed states, minus the ones off the grid
+        rest, track = divmod(state, TRACKS)
+        idx, direction = divmod(rest, 4)
+        grid, heat = self.grid, self.heat
+        moves = []
+        if track < 3:
+            ahead = grid.step(idx, direction)
+            if ahead != -1:
+                moves.append((state + (ahead - idx) * 4 * TRACKS + 1, heat[ahead]))
+        for turn in (direction + 1) % 4, (direction + 3) % 4:
+            beside = grid.step(idx, turn)
+            if beside != -1:
+                moves.append(((beside * 4 + turn) * TRACKS + 1, heat[beside]))
+        return moves
+
+    # == Distance field ==
+    # One Dijkstra backwards from the end gives the least heat from every
+    # packed Cart to the end, so after that any start is a lookup. It's also
+    # find_path's exact heuristic, and stays a safe one for rules that only
+    # take moves away, like closing cells off. Carts that can't get there
+    # read UNREACHABLE.
+
+    def distance_field(self) -> array:
+        self.index_cells()
+        end = self.grid.idx(self.end.x, self.end.y)
+        ends = [(end * 4 + direction) * TRACKS + track for direction in range(4) for track in range(TRACKS)]
+        search = Search(self.backwards, size=len(self.heat) * 4 * TRACKS)
+        search.run(ends)
+        return array("q", (UNREACHABLE if cost == INF else cost for cost in search.costs))
+
+    def backwards(self, state: int) -> list[tuple[int, int]]:
+        # The Carts whose moves reach state, at what it costs them
+        rest, track = divmod(state, TRACKS)
+        idx, direction = divmod(rest, 4)
+        behind = self.grid.step(idx, (direction + 2) % 4)
+        if track == 0 or behind == -1:
+            return []
+        lost = self.heat[idx]
+        came = [(state + (behind - idx) * 4 * TRACKS - 1, lost)]
+        if track == 1:
+            for turned in (direction + 1) % 4, (direction + 3) % 4:
+                came.extend(((behind * 4 + turned) * TRACKS + before, lost) for before in range(TRACKS))
+        return came
+
+    def heat_from(self, field: array, cart: Cart) -> int:
+        return field[self.pack(cart)]
 
     def heat_value(self, path: list[Vec]):
-        return sum(self.cells[pos].heat_loss for pos in path[1:]) + self.cells[self.end].heat_loss
+        return sum(self.cells[pos].heat_loss for pos in path[1:])
 
+    @debug_only
     def viz(self):
         print(self.height, self.width)
-        grid = []
-        for y in range(0, self.height):
-            row = []
-            for x in range(0, self.width):
-                pos = Vec(x, y)
-                if self.cells[pos] == self.start:
-                    row.append("S")
-                elif self.cells[pos] == self.end:
-                    row.append("E")
-                elif pos in self.best_path:
-                    row.append("*")
-                elif pos in self.cells:
-                    row.append(str(self.cells[pos]))
-                else:
-                    row.append("!")
-            grid.append("".join(row))
-        show("\n".join(grid), clear=True)
+        show(render(self.width, self.height, [
+            ([self.start.pos], "S"),
+            ([self.end], "E"),
+            (self.best_path, "*"),
+        ], base=self.rows), clear=True)
 
     def off_screen(self, pos: Vec):
         if pos.x >= self.width:
@@ -176,18 +255,55 @@ class State:
 def parse_line(state: State, line: str, y: int) -> State:
     state.height = y + 1
     state.width = len(line)
+    state.rows.append(line)
     for x, char in enumerate(line):
         pos = Vec(x, y)
         state.cells[pos] = Cell(pos, int(char))
     return state
 
+my_state = every(State(), ["123", "456", "789"], [parse_line])
+my_state.index_cells()
+for my_cart in [
+    Cart(Vec(1, 1), GOING_RIGHT, 0),
+    Cart(Vec(1, 1), GOING_DOWN, 2),
+    Cart(Vec(1, 1), GOING_UP, 3),
+    Cart(Vec(0, 0), GOING_LEFT, 1),
+]:
+    check(my_state.unpack(my_state.pack(my_cart)), my_cart)
+    check(
+        {(my_state.unpack(n), heat) for n, heat in my_state.moves(my_state.pack(my_cart))},
+        {(n, my_state.cells[n.pos].heat_loss) for n in my_cart.neighbours() if not my_state.off_screen(n.pos)},
+    )
+# backwards is moves turned round
+my_came: dict[int, set[tuple[int, int]]] = {state: set() for state in range(len(my_state.heat) * 4 * TRACKS)}
+for my_from in my_came:
+    for my_to, my_lost in my_state.moves(my_from):
+        my_came[my_to].add((my_from, my_lost))
+for my_to, my_from in my_came.items():
+    check(set(my_state.backwards(my_to)), my_from)
+
+my_state = every(State(), [
+    "11111",
+    "99991",
+    "99991",
+    "99991",
+    "99991",
+], [parse_line])
+my_state.end = Vec(4, 4)
+check(my_state.least_heat(1, 3, [HORIZONTAL, VERTICAL]), my_state.heat_value(my_state.find_path()))
+my_field = my_state.distance_field()
+check(my_state.heat_from(my_field, my_state.start), my_state.least_heat(1, 3, [HORIZONTAL, VERTICAL]))
+check(my_state.heat_value(my_state.find_path(my_field)), my_state.heat_from(my_field, my_state.start))
+
 def calculate(filename):
     state = State()
     state = every_line(state, filename, [parse_line])
     state.end = Vec(state.width - 1, state.height - 1)
-    path = state.find_path()
+    heat = state.least_heat(1, 3, [HORIZONTAL, VERTICAL])
     # state.viz()
-    return state.heat_value(path)
+    return heat
 
-pret("Trial", calculate("trial.txt"))
-pret("Input", calculate("input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    pret("Trial", calculate("trial.txt"))
+    pret("Input", calculate("input.txt"))
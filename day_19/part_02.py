@@ -6,7 +6,8 @@ import sys
 from time import sleep
 from typing import Self
 
-from utility.main import check, every_line, pret
+from utility.cache import snapshot
+from utility.main import check, every_line, parse_args, pret
 
 Trait = Enum("Trait", ["x", "m", "a", "s"])
 INF = 4001
@@ -171,10 +172,15 @@ def parse_line(state: State, line: str, _idx: int) -> State:
             raise Exception(f"Can't parse line: {line}")
     return state
 
-def calculate(filename: str):
+def parse(filename: str) -> State:
     state = State()
     every_line(state, filename, [parse_line])
-    return state.count_acceptable_ratings()
+    return state
+
+def calculate(filename: str):
+    return snapshot(parse, filename).count_acceptable_ratings()
 
-pret("Trial", calculate("trial.txt"))
-pret("Input", calculate("input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    pret("Trial", calculate("trial.txt"))
+    pret("Input", calculate("input.txt"))
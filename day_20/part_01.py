@@ -4,7 +4,8 @@ from enum import Enum
 import re
 from typing import Any, Literal, NamedTuple, Self, Union
 
-from utility.main import check, every_line, pret, tlog
+from utility.cache import snapshot
+from utility.main import check, every_line_bulk, logs, parse_args, pret, read_lines, tlog
 
 Signal = Enum("Signal", ["HIGH", "LOW"])
 
@@ -116,10 +117,12 @@ class State():
             Signal.HIGH: 0
         }
         queue = [SignalFire(Node("button"), self.start, Signal.LOW)]
+        verbose = logs(2)
         while len(queue) != 0:
             signal = queue.pop(0)
             counts[signal.value] += 1
-            tlog(2, f"{signal.src.name} -{signal.value}-> {signal.dest.name}")
+            if verbose:
+                tlog(2, "{} -{}-> {}", signal.src.name, signal.value, signal.dest.name)
             new_signals = signal.dest.process(signal)
             queue.extend(new_signals)
         return counts
@@ -162,14 +165,20 @@ def parse_line_for_edges(state: State, line: str, _idx: int) -> State:
         raise Exception(f"Could not parse line: {line}")
     return state
 
-def calculate(filename):
+def parse(filename: str) -> State:
     state = State()
-    every_line(state, filename, [parse_line_for_nodes])
-    every_line(state, filename, [parse_line_for_edges])
-    return state.calc_signal_sum(1000)
+    lines = read_lines(filename)
+    every_line_bulk(state, lines, [parse_line_for_nodes])
+    every_line_bulk(state, lines, [parse_line_for_edges])
+    return state
+
+def calculate(filename):
+    return snapshot(parse, filename).calc_signal_sum(1000)
 
-pret("Trial 1:", calculate("trial_1.txt"))
-pret("Trial 2:", calculate("trial_2.txt"))
-pret("Input:", calculate("input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    pret("Trial 1:", calculate("trial_1.txt"))
+    pret("Trial 2:", calculate("trial_2.txt"))
+    pret("Input:", calculate("input.txt"))
 
 # Don't forget to add the node to the conjunction on init!!!!
@@ -4,7 +4,9 @@ from enum import Enum
 import re
 from typing import Any, Literal, NamedTuple, Self, Union
 
-from utility.main import check, every_line, pret, tlog
+from utility.cache import snapshot
+from utility.checkpoint import Checkpoint
+from utility.main import check, every_line_bulk, logs, parse_args, pret, read_lines, tlog
 
 Signal = Enum("Signal", ["HIGH", "LOW"])
 
@@ -115,6 +117,7 @@ class State():
     def process_press(self):
         signals_processed = 0
         queue = [SignalFire(Node("button"), self.start, Signal.LOW)]
+        verbose = logs(2)
         while len(queue) != 0:
             signal = queue.pop(0)
             # if signal.dest.name == "rx" and signal.value == Signal.LOW:
@@ -127,15 +130,18 @@ class State():
                 elif signal.src.name in self.highs and self.highs[signal.src.name] == True:
                     self.highs[signal.src.name] = False
                     print(self.presses, signals_processed, signal.src.name, signal.value)
-            tlog(2, f"{signal.src.name} -{signal.value}-> {signal.dest.name}")
+            if verbose:
+                tlog(2, "{} -{}-> {}", signal.src.name, signal.value, signal.dest.name)
             new_signals = signal.dest.process(signal)
             queue.extend(new_signals)
             signals_processed += 1
 
-    def find_low_rx(self):
+    def find_low_rx(self, saved: Checkpoint[Self] | None = None):
         while True:
             self.presses += 1
             self.process_press()
+            if saved:
+                saved.tick(self)
             fun_node = self.nodes["rm"]
             # if fun_node.state["dp"] == Signal.HIGH:
             #     print(f"dp true: {self.presses}")
@@ -179,15 +185,22 @@ def parse_line_for_edges(state: State, line: str, _idx: int) -> State:
         raise Exception(f"Could not parse line: {line}")
     return state
 
-def calculate(filename):
+def parse(filename: str) -> State:
     state = State()
-    every_line(state, filename, [parse_line_for_nodes])
-    every_line(state, filename, [parse_line_for_edges])
-    return state.find_low_rx()
+    lines = read_lines(filename)
+    every_line_bulk(state, lines, [parse_line_for_nodes])
+    every_line_bulk(state, lines, [parse_line_for_edges])
+    return state
 
-# pret("Trial 1:", calculate("trial_1.txt"))
-# pret("Trial 2:", calculate("trial_2.txt"))
-pret("Input:", calculate("input.txt"))
+def calculate(filename):
+    with Checkpoint("day_20/part_02 presses", filename, __name__, check=100) as saved:
+        return saved.resume(snapshot(parse, filename)).find_low_rx(saved)
+
+if __name__ == "__main__":
+    parse_args()
+    # pret("Trial 1:", calculate("trial_1.txt"))
+    # pret("Trial 2:", calculate("trial_2.txt"))
+    pret("Input:", calculate("input.txt"))
 
 # Don't forget to add the node to the conjunction on init!!!!
 
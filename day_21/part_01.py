@@ -1,30 +1,16 @@
 from dataclasses import dataclass, field
-from typing import Self
 
-from utility.main import adj, check, every_line, pret, show
+from utility.frames import FrameRecorder
+from utility.main import adj, check, debug_only, every_line, parse_args, pret, show
+from utility.render import render
+from utility.vec import Vec
 
 
-@dataclass(frozen=True, order=True)
-class Vec:
-    x: int
-    y: int
-
-    def add(self, other):
-        return Vec(self.x + other.x, self.y + other.y)
-
-    def neighbours(self) -> set[Self]:
-        return {
-            Vec(self.x + 1, self.y),
-            Vec(self.x - 1, self.y),
-            Vec(self.x, self.y + 1),
-            Vec(self.x, self.y - 1),
-        }
-
 @dataclass
 class Grid:
     blocks: set[Vec] = field(default_factory=set)
 
-    def free_neighbours(self, vec: Vec) -> set[Vec]:
+    def free_neighbours(self, vec: Vec) -> frozenset[Vec]:
         return vec.neighbours().difference(self.blocks)
 
 my_grid = Grid({Vec(0, 1)})
@@ -47,40 +33,36 @@ class State:
     height: int = 0
 
     def calc_reachable_plots(self, n: int) -> int:
-        for n in range(1, n + 1):
-            parity = n % 2
-            new_new_cells = set()
-            for cell in self.new_cells:
-                if self.off_screen(cell):
-                    exit(1)
-                neighbours = self.grid.free_neighbours(cell)
-                new_new_cells.update(
-                    n for n in neighbours
-                    if n not in self.parities[parity]
-                )
-                self.parities[parity].update(neighbours)
-            self.new_cells.clear()
-            self.new_cells.update(new_new_cells)
-            self.viz()
-            print(n, len(new_new_cells), len(self.parities[n % 2]))
+        with FrameRecorder(self.render) as frames:
+            for n in range(1, n + 1):
+                parity = n % 2
+                new_new_cells = set()
+                for cell in self.new_cells:
+                    if self.off_screen(cell):
+                        exit(1)
+                    neighbours = self.grid.free_neighbours(cell)
+                    new_new_cells.update(
+                        n for n in neighbours
+                        if n not in self.parities[parity]
+                    )
+                    self.parities[parity].update(neighbours)
+                self.new_cells.clear()
+                self.new_cells.update(new_new_cells)
+                if frames.ready():
+                    frames.frame(set(self.parities[EVEN]), set(self.new_cells))
+                print(n, len(new_new_cells), len(self.parities[n % 2]))
         return len(self.parities[n % 2])
 
+    @debug_only
     def viz(self):
-        grid = []
-        for y in range(0, self.height):
-            row = []
-            for x in range(0, self.width):
-                pos = Vec(x, y)
-                if pos in self.grid.blocks:
-                    row.append("#")
-                elif pos in self.parities[EVEN]:
-                    row.append("O")
-                elif pos in self.new_cells:
-                    row.append("x")
-                else:
-                    row.append(".")
-            grid.append("".join(row))
-        show("\n".join(grid), clear=True)
+        show(self.render(self.parities[EVEN], self.new_cells), clear=True)
+
+    def render(self, even: set[Vec], new_cells: set[Vec]) -> str:
+        return render(self.width, self.height, [
+            (self.grid.blocks, "#"),
+            (even, "O"),
+            (new_cells, "x"),
+        ])
 
     def off_screen(self, pos):
         if pos.x >= self.width:
@@ -104,7 +86,7 @@ def parse_line(state: State, line: str, y: int) -> State:
             state.start = pos
     return state
 
-def calculate(filename, n: int):
+def calculate(filename, n: int = 64):
     state = State()
     every_line(state, filename, [parse_line])
     state.parities[ODD] = set()
@@ -113,5 +95,7 @@ def calculate(filename, n: int):
     state.viz()
     return state.calc_reachable_plots(n)
 
-pret("Trial:", calculate("trial.txt", 10000))
-# pret("Input:", calculate("input.txt", 64))
+if __name__ == "__main__":
+    parse_args()
+    pret("Trial:", calculate("trial.txt", 10000))
+    # pret("Input:", calculate("input.txt", 64))
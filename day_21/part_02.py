@@ -1,30 +1,15 @@
 from dataclasses import dataclass, field
-from typing import Self
 
-from utility.main import adj, check, every_line, pret, show
+from utility.main import adj, check, debug_only, every_line, parse_args, pret, show
+from utility.render import render
+from utility.vec import Vec
 
 
-@dataclass(frozen=True, order=True)
-class Vec:
-    x: int
-    y: int
-
-    def add(self, other):
-        return Vec(self.x + other.x, self.y + other.y)
-
-    def neighbours(self) -> set[Self]:
-        return {
-            Vec(self.x + 1, self.y),
-            Vec(self.x - 1, self.y),
-            Vec(self.x, self.y + 1),
-            Vec(self.x, self.y - 1),
-        }
-
 @dataclass
 class Grid:
     blocks: set[Vec] = field(default_factory=set)
 
-    def free_neighbours(self, vec: Vec) -> set[Vec]:
+    def free_neighbours(self, vec: Vec) -> frozenset[Vec]:
         return vec.neighbours().difference(self.blocks)
 
 my_grid = Grid({Vec(0, 1)})
@@ -64,22 +49,13 @@ class State:
             print(n, len(new_new_cells), len(self.parities[n % 2]))
         return len(self.parities[n % 2])
 
+    @debug_only
     def viz(self):
-        grid = []
-        for y in range(0, self.height):
-            row = []
-            for x in range(0, self.width):
-                pos = Vec(x, y)
-                if pos in self.grid.blocks:
-                    row.append("#")
-                elif pos in self.parities[EVEN]:
-                    row.append("O")
-                elif pos in self.new_cells:
-                    row.append("x")
-                else:
-                    row.append(".")
-            grid.append("".join(row))
-        show("\n".join(grid), clear=True)
+        show(render(self.width, self.height, [
+            (self.grid.blocks, "#"),
+            (self.parities[EVEN], "O"),
+            (self.new_cells, "x"),
+        ]), clear=True)
 
     def off_screen(self, pos):
         if pos.x >= self.width:
@@ -103,7 +79,7 @@ def parse_line(state: State, line: str, y: int) -> State:
             state.start = pos
     return state
 
-def calculate(filename, n: int):
+def calculate(filename, n: int = 100000):
     state = State()
     every_line(state, filename, [parse_line])
     state.parities[ODD] = set()
@@ -112,4 +88,6 @@ def calculate(filename, n: int):
     state.viz()
     return state.calc_reachable_plots(n)
 
-pret("Input:", calculate("input_2.txt", 100000))
+if __name__ == "__main__":
+    parse_args()
+    pret("Input:", calculate("input_2.txt", 100000))
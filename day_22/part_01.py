@@ -3,7 +3,8 @@ from functools import cache
 import re
 from typing import Self
 
-from utility.main import check, every_line, pret
+from utility.cache import snapshot
+from utility.main import check, every_line, parse_args, pret
 
 
 @dataclass(frozen=True)
@@ -136,10 +137,15 @@ def parse_line(state: State, line: str, _idx: int) -> State:
     return state
 
 
-def calculate(filename):
+def parse(filename: str) -> State:
     state = State()
     every_line(state, filename, [parse_line])
-    return state.count_disintegratable()
+    return state
+
+def calculate(filename):
+    return snapshot(parse, filename).count_disintegratable()
 
-pret("Trial:", calculate("trial.txt"))
-pret("Input:", calculate("input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    pret("Trial:", calculate("trial.txt"))
+    pret("Input:", calculate("input.txt"))
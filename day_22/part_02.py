@@ -3,7 +3,8 @@ from functools import cache
 import re
 from typing import Self
 
-from utility.main import check, every_line, pret, show
+from utility.cache import snapshot
+from utility.main import check, every_line, parse_args, pret, show
 
 
 @dataclass(frozen=True)
@@ -169,16 +170,22 @@ def parse_line(state: State, line: str, _idx: int) -> State:
     return state
 
 
-def calculate(filename):
+def parse(filename: str) -> State:
     state = State()
     every_line(state, filename, [parse_line])
+    return state
+
+def calculate(filename):
+    state = snapshot(parse, filename)
     state.count_disintegratable()
     # show(state.blocks_supporting, clear=True)
     # return state.count_falls(Block(Vec3(1, 0, 1), Vec3(1, 2, 1)))
     return state.count_all_falls()
 
-# pret("Trial:", calculate("trial.txt"))
-pret("Input:", calculate("input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    # pret("Trial:", calculate("trial.txt"))
+    pret("Input:", calculate("input.txt"))
 # 1038654847562430945429691581559826288 - too high
 # 431900 - too high
 # 84878 - too high
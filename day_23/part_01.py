@@ -1,42 +1,26 @@
-from collections import defaultdict
 from dataclasses import dataclass, field
-from heapq import heappop, heappush
-import math
-from typing import Self
+from typing import AbstractSet
 
-from utility.main import check, every, every_line, pret, show
+from utility.grid import DOWN, LEFT, RIGHT, UP, Grid
+from utility.main import check, debug_only, every, every_line, parse_args, pret, show
+from utility.render import render
+from utility.search import Search
+from utility.vec import Vec
 
 
-@dataclass(frozen=True, order=True)
-class Vec:
-    x: int
-    y: int
-
-    def add(self, other):
-        return Vec(self.x + other.x, self.y + other.y)
-
-    def hdist(self, to: Self) -> int:
-        return abs(to.x - self.x) + abs(to.y - self.y)
-
-    def ortho(self):
-        return {
-            Vec(self.x, self.y - 1),
-            Vec(self.x + 1, self.y),
-            Vec(self.x, self.y + 1),
-            Vec(self.x - 1, self.y),
-        }
-
 GOING_RIGHT = Vec(1, 0)
 GOING_LEFT = Vec(-1, 0)
 GOING_UP = Vec(0, -1)
 GOING_DOWN = Vec(0, 1)
+# In utility.grid's order, so the way back is +2 mod 4
+DIRECTIONS = [GOING_RIGHT, GOING_DOWN, GOING_LEFT, GOING_UP]
 
 @dataclass(frozen=True)
 class Cell:
     pos: Vec
     kind: str
 
-    def exits(self) -> set[Vec]:
+    def exits(self) -> AbstractSet[Vec]:
         if self.kind == ".":
             return self.pos.ortho()
         elif self.kind == ">":
@@ -50,7 +34,7 @@ class Cell:
         else:
             return set()
 
-    def entries(self) -> set[Vec]:
+    def entries(self) -> AbstractSet[Vec]:
         if self.kind == "#":
             return set()
         return self.pos.ortho()
@@ -96,6 +80,12 @@ my_cell = Cell(Vec(1, 1), "#")
 check(my_cell.exits(), set())
 check(my_cell.entries(), set())
 
+SLOPES = {">": RIGHT, "v": DOWN, "<": LEFT, "^": UP}
+
+def leaves(kind: str, direction: int) -> bool:
+    # Whether a cell of this kind can be left going that way
+    return kind == "." or SLOPES.get(kind) == direction
+
 @dataclass(frozen=True, order=True)
 class Cursor:
     pos: Vec
@@ -111,33 +101,20 @@ class State:
     width: int = 0
     focus: Vec = Vec(0, 0)
     best_path: list[Vec] = field(default_factory=list)
+    rows: list[str] = field(default_factory=list)
+    junction_bits: list[int] = field(default_factory=list)
+    exits: list[list[tuple[int, int]]] = field(default_factory=list)
 
     def count_steps_in_longest_path(self):
-        to_check: list[tuple[float, Cursor]] = []
-        starting_cursor = Cursor(self.start, self.start.add(GOING_UP), frozenset())
-        heappush(to_check, (self.start.hdist(self.end), starting_cursor))
-        came_from: dict[Cursor, Cursor] = {}
-        g_score: dict[Cursor, float] = defaultdict(lambda: math.inf)
-        g_score[starting_cursor] = 0
-        f_score: dict[Cursor, float] = defaultdict(lambda: math.inf)
-        f_score[starting_cursor] = self.start.hdist(self.end)
-        ends: set[Cursor] = set()
-
-        while len(to_check) != 0:
-            _, current = heappop(to_check)
-            if current.pos == self.end:
-                ends.add(current)
-
-            for neighbour in self.neighbours(current):
-                tentative_g_score = g_score[current] - 1
-                if tentative_g_score < g_score[neighbour]:
-                    came_from[neighbour] = current
-                    g_score[neighbour] = tentative_g_score
-                    f_score[neighbour] = tentative_g_score - neighbour.pos.hdist(self.end)
-                    if neighbour not in to_check:
-                        heappush(to_check, (f_score[neighbour], neighbour))
-
-        return min(len(self.reconstruct_path(came_from, end)) for end in ends)
+        self.index_cells()
+        cells = self.width * self.height
+        to_end = [abs(self.end.x - x) + abs(self.end.y - y) for y in range(self.height) for x in range(self.width)]
+        end = self.end.y * self.width + self.end.x
+        # Steps cost -1 and nothing stops early, so this finds the longest
+        search = Search(self.moves, heuristic=lambda state: -to_end[state // 4 % cells])
+        search.run([self.pack(Cursor(self.start, self.start.add(GOING_UP), frozenset()))])
+        ends = [state for state in search.reached() if state // 4 % cells == end]
+        return -min(search.cost(state) for state in ends)
 
     def reconstruct_path(self, came_from: dict[Cursor, Cursor], current: Cursor) -> list[Vec]:
         total_path: list[Vec] = []
@@ -146,6 +123,66 @@ class State:
             total_path.append(current.pos)
         return list(reversed(total_path))
 
+    # == Packed ==
+    # Search states are Cursors packed into ints, see utility.search. Every
+    # junction gets a bit, so inroads_visited is a mask, and prev is the
+    # direction it's in.
+
+    def index_cells(self):
+        # Cell.exits and is_inroad, worked out once per cell on the raw rows
+        grid = Grid.from_lines(self.rows)
+        self.junction_bits = [0] * len(grid)
+        self.exits = [[] for _ in range(len(grid))]
+        junctions = 0
+        for idx in range(len(grid)):
+            kind = grid[idx]
+            if kind == "#":
+                continue
+            inroads = 0
+            for direction in range(4):
+                ext = grid.step(idx, direction)
+                if ext == -1 or grid[ext] == "#":
+                    continue
+                if leaves(grid[ext], (direction + 2) % 4):
+                    inroads += 1
+                if leaves(kind, direction):
+                    self.exits[idx].append((ext, direction))
+            if inroads > 2:
+                self.junction_bits[idx] = 1 << junctions
+                junctions += 1
+
+    def pack(self, cursor: Cursor) -> int:
+        cells = self.width * self.height
+        mask = 0
+        for pos in cursor.inroads_visited:
+            mask |= self.junction_bits[pos.y * self.width + pos.x]
+        prev = DIRECTIONS.index(cursor.prev.sub(cursor.pos))
+        return (mask * cells + cursor.pos.y * self.width + cursor.pos.x) * 4 + prev
+
+    def unpack(self, state: int) -> Cursor:
+        rest, prev = divmod(state, 4)
+        mask, idx = divmod(rest, self.width * self.height)
+        y, x = divmod(idx, self.width)
+        pos = Vec(x, y)
+        inroads_visited = frozenset(
+            Vec(j % self.width, j // self.width)
+            for j, bit in enumerate(self.junction_bits) if bit & mask
+        )
+        return Cursor(pos, pos.add(DIRECTIONS[prev]), inroads_visited)
+
+    def moves(self, state: int) -> list[tuple[int, int]]:
+        # neighbours() on packed states
+        cells = self.width * self.height
+        rest, prev = divmod(state, 4)
+        mask, idx = divmod(rest, cells)
+        bits = self.junction_bits
+        after = mask | bits[idx]
+        return [
+            ((after * cells + ext) * 4 + (direction + 2) % 4, -1)
+            for ext, direction in self.exits[idx]
+            if direction != prev and not bits[ext] & mask
+        ]
+
     def is_inroad(self, cell: Cell) -> int:
         all_entries = cell.entries()
         inroads = [
@@ -185,24 +222,17 @@ class State:
             return True
         return False
 
+    @debug_only
     def viz(self):
-        grid = []
-        for y in range(0, self.height):
-            row = []
-            for x in range(0, self.width):
-                pos = Vec(x, y)
-                if pos == self.focus:
-                    row.append('*')
-                elif pos in self.best_path:
-                    row.append('O')
-                else:
-                    row.append(self.cells[pos].kind)
-            grid.append("".join(row))
-        show("\n".join(grid), clear=True)
+        show(render(self.width, self.height, [
+            ([self.focus], '*'),
+            (self.best_path, 'O'),
+        ], base=self.rows), clear=True)
 
 def parse_line(state: State, line: str, y: int) -> State:
     state.height = y + 1
     state.width = len(line)
+    state.rows.append(line)
     state.end = Vec(state.width - 2, state.height - 1)
     for x, char in enumerate(line):
         pos = Vec(x, y)
@@ -235,6 +265,14 @@ check(my_state.neighbours(my_cursor), {
 })
 my_cursor = Cursor(Vec(6, 4), Vec(5, 4), frozenset({Vec(7, 4)}))
 check(my_state.neighbours(my_cursor), set())
+my_state.index_cells()
+for my_cursor in [
+    Cursor(Vec(6, 4), Vec(5, 4), frozenset()),
+    Cursor(Vec(7, 4), Vec(6, 4), frozenset()),
+    Cursor(Vec(7, 4), Vec(7, 3), frozenset({Vec(7, 4)})),
+]:
+    check(my_state.unpack(my_state.pack(my_cursor)), my_cursor)
+    check({my_state.unpack(n) for n, _ in my_state.moves(my_state.pack(my_cursor))}, my_state.neighbours(my_cursor))
 check(my_state.count_steps_in_longest_path(), 13)
 
 def calculate(filename):
@@ -245,5 +283,7 @@ def calculate(filename):
     state.viz()
     return count
 
-pret("Trial:", calculate("trial.txt"))
-pret("Input:", calculate("input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    pret("Trial:", calculate("trial.txt"))
+    pret("Input:", calculate("input.txt"))
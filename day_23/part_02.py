@@ -1,289 +1,153 @@
-from collections import defaultdict
 from dataclasses import dataclass, field
-from heapq import heappop, heappush
-import math
-from typing import Self
+import time
 
-from utility.main import check, every, every_line, imagify, pret, show
+from utility.grid import Grid
+from utility.main import check, every, every_line, parse_args, pret, tlog
+from utility.search import Search
+from utility.vec import Vec
 
 
-@dataclass(frozen=True, order=True)
-class Vec:
-    x: int
-    y: int
-
-    def add(self, other):
-        return Vec(self.x + other.x, self.y + other.y)
-
-    def hdist(self, to: Self) -> int:
-        return abs(to.x - self.x) + abs(to.y - self.y)
-
-    def ortho(self):
-        return {
-            Vec(self.x, self.y - 1),
-            Vec(self.x + 1, self.y),
-            Vec(self.x, self.y + 1),
-            Vec(self.x - 1, self.y),
-        }
-
-GOING_RIGHT = Vec(1, 0)
-GOING_LEFT = Vec(-1, 0)
-GOING_UP = Vec(0, -1)
-GOING_DOWN = Vec(0, 1)
-
-@dataclass(frozen=True)
-class Cell:
-    pos: Vec
-    kind: str
-
-    def exits(self) -> set[Vec]:
-        if self.kind == "#":
-            return set()
-        else:
-            return self.pos.ortho()
-
-    def entries(self) -> set[Vec]:
-        if self.kind == "#":
-            return set()
-        return self.pos.ortho()
-
-
-my_cell = Cell(Vec(1, 1), ".")
-my_cell = Cell(Vec(1, 1), ".")
-check(my_cell.exits(), {
-    Vec(x=1, y=0), Vec(x=1, y=2), Vec(x=2, y=1), Vec(x=0, y=1)
-})
-check(my_cell.entries(), {
-    Vec(x=1, y=0), Vec(x=1, y=2), Vec(x=2, y=1), Vec(x=0, y=1)
-})
-my_cell = Cell(Vec(1, 1), ">")
-check(my_cell.exits(), {
-    Vec(x=1, y=0), Vec(x=1, y=2), Vec(x=2, y=1), Vec(x=0, y=1)
-})
-check(my_cell.entries(), {
-    Vec(x=1, y=0), Vec(x=1, y=2), Vec(x=2, y=1), Vec(x=0, y=1)
-})
-my_cell = Cell(Vec(1, 1), "<")
-check(my_cell.exits(), {
-    Vec(x=1, y=0), Vec(x=1, y=2), Vec(x=2, y=1), Vec(x=0, y=1)
-})
-check(my_cell.entries(), {
-    Vec(x=1, y=0), Vec(x=1, y=2), Vec(x=2, y=1), Vec(x=0, y=1)
-})
-my_cell = Cell(Vec(1, 1), "^")
-check(my_cell.exits(), {
-    Vec(x=1, y=0), Vec(x=1, y=2), Vec(x=2, y=1), Vec(x=0, y=1)
-})
-check(my_cell.entries(), {
-    Vec(x=1, y=0), Vec(x=1, y=2), Vec(x=2, y=1), Vec(x=0, y=1)
-})
-my_cell = Cell(Vec(1, 1), "v")
-check(my_cell.exits(), {
-    Vec(x=1, y=0), Vec(x=1, y=2), Vec(x=2, y=1), Vec(x=0, y=1)
-})
-check(my_cell.entries(), {
-    Vec(x=1, y=0), Vec(x=1, y=2), Vec(x=2, y=1), Vec(x=0, y=1)
-})
-my_cell = Cell(Vec(1, 1), "#")
-check(my_cell.exits(), set())
-check(my_cell.entries(), set())
-
-@dataclass(frozen=True, order=True)
-class Cursor:
-    pos: Vec
-    prev: Vec
-    inroads_visited: frozenset[Vec]
+@dataclass
+class Junctions:
+    # Junctions numbered in reading order, edges[i] is (j, steps) for each
+    # corridor from i to j
+    positions: list[Vec]
+    edges: list[list[tuple[int, int]]]
+    start: int
+    end: int
 
 @dataclass
 class State:
-    cells: dict[Vec, Cell] = field(default_factory=dict)
     start: Vec = Vec(1, 0)
     end: Vec = Vec(0, 0)
     height: int = 0
     width: int = 0
-    focus: Vec = Vec(0, 0)
-    best_path: list[Vec] = field(default_factory=list)
-    _is_inroad: dict[Cell, bool] = field(default_factory=dict)
-    _neighbours: dict[Cursor, set[tuple[Cursor, int]]] = field(default_factory=dict)
-    _pairs: dict[tuple[Vec, Vec], int] = field(default_factory=dict)
-
-    def count_junctions(self):
-        seen: set[Vec] = set()
-        to_see: set[Cursor] = {Cursor(self.start, self.start.add(Vec(0, -1)), frozenset())}
-        edges: dict[Vec, set[tuple[Vec, int]]] = {}
-        while len(to_see) != 0:
-            current = to_see.pop()
-            seen.add(current.pos)
-            for curs, cost in self.neighbours(current):
-                if current.pos not in edges:
-                    edges[current.pos] = set()
-                if curs.pos not in edges:
-                    edges[curs.pos] = set()
-                edges[current.pos].add((curs.pos, cost))
-                edges[curs.pos].add((current.pos, cost))
-                if curs.pos not in seen:
-                    to_see.add(Cursor(curs.pos, curs.prev, frozenset()))
-
-        self.viz2(seen, [])
-        print(len(edges))
-        print(edges)
-        exit(1)
-
-    def count_steps_in_longest_path(self):
-        seen: set[Vec] = set()
-        to_check: list[Cursor] = []
-        starting_cursor = Cursor(self.start, self.start.add(GOING_UP), frozenset())
-        to_check.append(starting_cursor)
-        came_from: dict[Cursor, Cursor] = {}
-        g_score: dict[Cursor, float] = defaultdict(lambda: math.inf)
-        g_score[starting_cursor] = 0
-        ends: set[Cursor] = set()
-        n = 0
-
-        while len(to_check) != 0:
-            current = to_check.pop()
-            seen.add(current.pos)
-            n += 1
-            if n % 1000 == 0:
-                self.viz(seen, came_from, current)
-            if current.pos == self.end:
-                ends.add(current)
-                print(-1*min(g_score[end] for end in ends))
-            neighbours = self.neighbours(current)
-
-            for (neighbour, cost) in neighbours:
-                self._pairs[current.pos, neighbour.pos] = cost
-                tentative_g_score = g_score[current] - cost
-                if tentative_g_score < g_score[neighbour]:
-                    came_from[neighbour] = current
-                    g_score[neighbour] = tentative_g_score
-                    if neighbour not in to_check:
-                        to_check.append(neighbour)
-
-        return -1*min(g_score[end] for end in ends)
-
-    def reconstruct_path(self, came_from: dict[Cursor, Cursor], current: Cursor) -> list[Vec]:
-        total_path: list[Vec] = []
-        while current in came_from:
-            current = came_from[current]
-            total_path.append(current.pos)
-        return list(reversed(total_path))
-
-    def is_inroad(self, cell: Cell) -> int:
-        if cell in self._is_inroad:
-            return self._is_inroad[cell]
-        all_entries = cell.entries()
-        inroads = [
-            self.cells[vec] for vec in all_entries
-            if not self.off_screen(vec)
-               and cell.pos in self.cells[vec].exits()
+    rows: list[str] = field(default_factory=list)
+
+    # == Junction graph ==
+    # Away from junctions (3 or more open neighbours) the map is corridors
+    # with one way in and one way out, so a walk only has choices at
+    # junctions. Walk each corridor once and keep its length, and the longest
+    # path is over a few dozen numbered junctions rather than every cell.
+
+    def junction_graph(self) -> Junctions:
+        grid = Grid.from_lines(self.rows)
+        start = grid.idx(self.start.x, self.start.y)
+        end = grid.idx(self.end.x, self.end.y)
+        nodes = [
+            idx for idx in range(len(grid))
+            if grid[idx] != "#" and (idx in (start, end) or len(list(grid.open_neighbours(idx))) > 2)
         ]
-        self._is_inroad[cell] = len(inroads) > 2
-        return self._is_inroad[cell]
-
-    def neighbours(self, cursor: Cursor, cost = 1) -> set[tuple[Cursor, int]]:
-        if cursor in self._neighbours and cost == 1:
-            return self._neighbours[cursor]
-        cell = self.cells[cursor.pos]
-        exits = cell.exits()
-        good_exits = set()
-        for ext in exits:
-            if self.off_screen(ext):
-                continue
-            elif cell.pos not in self.cells[ext].entries():
-                continue
-            if ext in cursor.inroads_visited:
-                continue
-            if ext == cursor.prev:
-                continue
-            inroads_visited = cursor.inroads_visited
-            if self.is_inroad(cell):
-                inroads_visited = frozenset({cell.pos, *cursor.inroads_visited})
-            good_exits.add(Cursor(ext, cursor.pos, inroads_visited))
-        if len(good_exits) == 1 and list(good_exits)[0].pos != self.end:
-            result = self.neighbours(list(good_exits)[0], cost + 1)
-        elif cost > 1:
-            result = {(ext, cost) for ext in {cursor}}
-        else:
-            result = set()
-            for ext in good_exits:
-                if ext.pos == self.end:
-                    result.add((ext, cost))
+        number = {idx: i for i, idx in enumerate(nodes)}
+        edges: list[list[tuple[int, int]]] = [[] for _ in nodes]
+        for i, idx in enumerate(nodes):
+            for at in grid.open_neighbours(idx):
+                came, steps = idx, 1
+                while at not in number:
+                    ahead = [n for n in grid.open_neighbours(at) if n != came]
+                    if not ahead:
+                        # Dead end
+                        break
+                    came, at, steps = at, ahead[0], steps + 1
                 else:
-                    result.update(self.neighbours(ext, cost + 1))
-        if cost == 1:
-            self._neighbours[cursor] = result
-            return self._neighbours[cursor]
-        return result
-
-    def off_screen(self, pos: Vec):
-        if pos.x >= self.width:
-            return True
-        elif pos.x < 0:
-            return True
-        elif pos.y >= self.height:
-            return True
-        elif pos.y < 0:
-            return True
-        return False
-
-    def viz(self, seen = {}, came_from = None, pos = None):
-        grid = []
-        for fr, to in self._pairs.keys():
-            cost = self._pairs[(fr, to)]
-            show(f"\"{fr}\" -> \"{to}\" [label=\"{cost}\"]")
-        if came_from != None and pos != None:
-            best_path_here = self.reconstruct_path(came_from, pos)
-        else:
-            best_path_here = []
-        for y in range(0, self.height):
-            row = []
-            for x in range(0, self.width):
-                pos = Vec(x, y)
-                if pos in best_path_here:
-                    row.append('Y')
-                elif pos in seen:
-                    row.append('R')
-                elif self.cells[pos].kind == "#":
-                    row.append('#')
-                else:
-                    row.append('#')
-            grid.append("".join(row))
-        imagify("show.png", grid)
-
-    def viz2(self, highlight, highlight2):
-        grid = []
-        for y in range(0, self.height):
-            row = []
-            for x in range(0, self.width):
-                pos = Vec(x, y)
-                if pos in highlight2:
-                    row.append('M')
-                elif pos in highlight:
-                    row.append('R')
-                elif self.cells[pos].kind == "#":
-                    row.append('#')
-                else:
-                    row.append('G')
-            grid.append("".join(row))
-        imagify("show2.png", grid)
+                    if number[at] != i:
+                        edges[i].append((number[at], steps))
+        return Junctions([Vec(*grid.xy(idx)) for idx in nodes], edges, number[start], number[end])
+
+    # == Longest path ==
+    # Depth first over the junctions with the visited ones as bits of an
+    # int, so a partial path costs a frame on the stack and nothing else.
+    # From each junction, flood out over the ones not visited yet: if the end
+    # isn't among them the walk is stuck, and if taking the longest corridor
+    # into every one of them still can't beat the best so far, it's dropped.
+    # The junction next to the end has to go straight there, anything else
+    # walls the end off behind a junction it's been through.
+
+    def count_steps_in_longest_path(self) -> int:
+        junctions = self.junction_graph()
+        edges = [sorted(out, key=lambda edge: -edge[1]) for out in junctions.edges]
+        start, end = junctions.start, junctions.end
+        longest_in = [max((steps for _, steps in out), default=0) for out in edges]
+        if len(edges[end]) == 1:
+            last = edges[end][0][0]
+            edges[last] = [(to, steps) for to, steps in edges[last] if to == end]
+        around = [sum(1 << to for to, _ in out) for out in edges]
+        best = -1
+        walks = 0
+
+        def walk(at: int, visited: int, steps: int):
+            nonlocal best, walks
+            walks += 1
+            if at == end:
+                if steps > best:
+                    best = steps
+                    tlog(1, "New best {}", best)
+                return
+            spare, seen, frontier = 0, 1 << at, 1 << at
+            while frontier:
+                bit = frontier & -frontier
+                frontier ^= bit
+                node = bit.bit_length() - 1
+                fresh = around[node] & ~(visited | seen)
+                seen |= fresh
+                frontier |= fresh
+                spare += longest_in[node]
+            if not seen >> end & 1 or steps + spare - longest_in[at] <= best:
+                return
+            for to, length in edges[at]:
+                if not visited >> to & 1:
+                    walk(to, visited | 1 << to, steps + length)
+
+        began = time.perf_counter()
+        walk(start, 1 << start, 0)
+        tlog(1, "{} walks in {:.3f}s", walks, time.perf_counter() - began)
+        if best < 0:
+            raise Exception("Couldn't find path :(")
+        return best
+
+    def count_steps_by_search(self) -> int:
+        # The first go, kept to check the DFS above on small grids: a Search
+        # over the junction and a bitmask of the ones already visited packed
+        # into an int, see utility.search. Steps cost -1 and it runs until
+        # nothing is left, so the cheapest way to the end is the longest. It
+        # keeps a cost for every visited set it reaches, so it's no good on
+        # a real input.
+        junctions = self.junction_graph()
+        count = len(junctions.positions)
+        edges, end = junctions.edges, junctions.end
+        to_end = [pos.mdist(self.end) for pos in junctions.positions]
+
+        def moves(packed: int) -> list[tuple[int, int]]:
+            visited, at = divmod(packed, count)
+            visited |= 1 << at
+            return [
+                (visited * count + to, -steps)
+                for to, steps in edges[at]
+                if not visited >> to & 1
+            ]
+
+        search = Search(moves, heuristic=lambda packed: -to_end[packed % count])
+        best = 0
+
+        def expanded(packed: int):
+            nonlocal best
+            if packed % count == end and search.cost(packed) < best:
+                best = search.cost(packed)
+                tlog(1, "New best {}", -best)
+
+        search.run([junctions.start], expanded=expanded)
+        ends = [packed for packed in search.reached() if packed % count == end]
+        if not ends:
+            raise Exception("Couldn't find path :(")
+        return -min(search.cost(packed) for packed in ends)
 
 def parse_line(state: State, line: str, y: int) -> State:
     state.height = y + 1
     state.width = len(line)
+    state.rows.append(line)
     state.end = Vec(state.width - 2, state.height - 1)
-    for x, char in enumerate(line):
-        pos = Vec(x, y)
-        state.cells[pos] = Cell(pos, char)
     return state
 
-my_state = every(State(), [
-    "#.###",
-    "#...#",
-    "###.#",
-], [parse_line])
-my_state.viz()
-
 my_state = every(State(), [
     "#.#######",
     "#.>.#...#",
@@ -293,29 +157,38 @@ my_state = every(State(), [
     "#######.#",
 ], [parse_line])
 
-# check(my_state.is_inroad(my_state.cells[Vec(1, 0)]), False)
-# check(my_state.is_inroad(my_state.cells[Vec(1, 1)]), True)
-# check(my_state.is_inroad(my_state.cells[Vec(1, 2)]), False)
-# check(my_state.is_inroad(my_state.cells[Vec(7, 4)]), True)
-# my_cursor = Cursor(Vec(6, 4), Vec(5, 4), frozenset())
-# check(my_state.neighbours(my_cursor), {
-#     Cursor(Vec(7, 4), Vec(6, 4), frozenset())
-# })
-# my_cursor = Cursor(Vec(6, 4), Vec(5, 4), frozenset({Vec(7, 4)}))
-# check(my_state.neighbours(my_cursor), set())
-# check(my_state.count_steps_in_longest_path(), 13)
+my_junctions = my_state.junction_graph()
+check(my_junctions.positions, [Vec(1, 0), Vec(1, 1), Vec(7, 4), Vec(7, 5)])
+check((my_junctions.start, my_junctions.end), (0, 3))
+check(sorted(my_junctions.edges[1]), [(0, 1), (2, 9), (2, 11)])
+check(my_state.count_steps_in_longest_path(), 13)
+
+# A small lattice, where the pruning and the forced last move get to matter
+my_state = every(State(), [
+    "#.##########",
+    "#..#########",
+    "##........##",
+    "##.##.###.##",
+    "##.##.###.##",
+    "##.##.###.##",
+    "##........##",
+    "##.##.###.##",
+    "##.##.###.##",
+    "##........##",
+    "#########..#",
+    "##########.#",
+], [parse_line])
+check(my_state.count_steps_in_longest_path(), my_state.count_steps_by_search())
 
 def calculate(filename):
     state = State()
     every_line(state, filename, [parse_line])
-    state.count_junctions()
-    # print(state.end) #139,140
-    # count = state.count_steps_in_longest_path()
-    # state.viz()
-    # return count
+    return state.count_steps_in_longest_path()
 
-# pret("Trial:", calculate("trial.txt"))
-pret("Input:", calculate("input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    # pret("Trial:", calculate("trial.txt"))
+    pret("Input:", calculate("input.txt"))
 # 5570 - too low
 # 5766 - too low
 # 5978 - too low
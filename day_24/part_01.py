@@ -6,7 +6,7 @@ from math import ceil, floor
 import re
 from typing import Self
 
-from utility.main import check, every_line, pret
+from utility.main import check, every_line, parse_args, pret
 
 @dataclass(frozen=True)
 class Vec:
@@ -137,7 +137,7 @@ my_state = State((7, 27))
 my_state = parse_line(my_state, "19, 13, 30 @ -2, 1, -2", 0)
 check(my_state.particles[0], Particle(Vec(D("19"), D("13")), Vec(D("-2"), D("1"))))
 
-def calculate(area, filename):
+def calculate(filename, area=(D("200000000000000"), D("400000000000000"))):
     state = State(area)
     state = every_line(state, filename, [parse_line])
     retval = state.count_intersections()
@@ -149,5 +149,7 @@ def calculate(area, filename):
                 print(i)
     return retval
 
-# pret("Trial:", calculate((7, 27), "trial.txt"))
-pret("Input:", calculate((D("200000000000000"), D("400000000000000")), "input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    # pret("Trial:", calculate("trial.txt", (7, 27)))
+    pret("Input:", calculate("input.txt"))
@@ -7,7 +7,7 @@ import re
 from time import sleep
 from typing import Self
 
-from utility.main import check, every_line, pret, tlog
+from utility.main import check, every_line, parse_args, parser, pret, tlog
 
 @dataclass(frozen=True)
 class Vec:
@@ -79,13 +79,13 @@ class State:
         for p in pool or self.particles:
             hit, coord, msg = self.does_hit(candidate, p)
             if hit:
-                tlog(2, f"HIT: {p} {coord} {msg}")
+                tlog(2, "HIT: {} {} {}", p, coord, msg)
                 coords.append(p)
                 total += 1
             else:
                 if pool != None:
                     return total, coords
-                tlog(3, f"MISS: {p} {msg}")
+                tlog(3, "MISS: {} {}", p, msg)
         return total, coords
 
     def does_hit(self, p1: Particle, p2: Particle) -> tuple[bool, Vec | None, str]:
@@ -184,16 +184,11 @@ my_state = State()
 my_state = parse_line(my_state, "19, 13, 30 @ -2, 1, -2", 0)
 check(my_state.particles[0], Particle(Vec(D("19"), D("13"), D("30")), Vec(D("-2"), D("1"), D("-2"))))
 
-def calculate(filename, good_particle = None):
+def calculate(filename, good_particle = None, dim = "x,y,z"):
     state = State()
     state = every_line(state, filename, [parse_line])
-    import argparse
-    parser = argparse.ArgumentParser(description='Do AoC')
-    parser.add_argument('-l', '--log', default=999, type=int)
-    parser.add_argument('-d', '--dim', default="x,y,z", type=str)
-    args = parser.parse_args()
     best_cand = g = Particle(Vec(D("309721960025816"), D("434470227085520"), D("164429529509188")), Vec(D("-63"), D("-263"), D("195")))
-    state.dims = set(args.dim.split(","))
+    state.dims = set(dim.split(","))
     print(state.dims)
     best_count, coords = state.check(g)
     print(f"INIT: {g} {best_count}/{len(state.particles)}")
@@ -300,9 +295,11 @@ def calculate(filename, good_particle = None):
 
 
 
-# pret("Trial:", calculate("trial.txt", good_particle))
-
-pret("Input:", calculate("input.txt", None))
+if __name__ == "__main__":
+    parser.add_argument('-d', '--dim', default="x,y,z", type=str)
+    args = parse_args()
+    # pret("Trial:", calculate("trial.txt", good_particle))
+    pret("Input:", calculate("input.txt", None, args.dim))
 
 # 431282096438444 - too low
 # 472978148847396 - too low
@@ -7,7 +7,7 @@ import re
 from time import sleep
 from typing import Self
 
-from utility.main import check, every_line, pret, tlog
+from utility.main import check, every_line, parse_args, pret, tlog
 
 @dataclass(frozen=True)
 class Vec:
@@ -85,13 +85,13 @@ class State:
         for p in pool or self.particles:
             hit, coord, msg = self.does_hit(candidate, p)
             if hit:
-                tlog(2, f"HIT: {p} {coord} {msg}")
+                tlog(2, "HIT: {} {} {}", p, coord, msg)
                 coords.append(p)
                 total += 1
             else:
                 if pool != None:
                     return total, coords
-                tlog(3, f"MISS: {p} {msg}")
+                tlog(3, "MISS: {} {}", p, msg)
         return total, coords
 
     def does_hit(self, p1: Particle, p2: Particle) -> tuple[bool, Vec | None, str]:
@@ -179,9 +179,10 @@ def calculate(filename, good_particle = None):
 
 
 
-# pret("Trial:", calculate("trial.txt", good_particle))
-
-pret("Input:", calculate("input.txt", None))
+if __name__ == "__main__":
+    parse_args()
+    # pret("Trial:", calculate("trial.txt", good_particle))
+    pret("Input:", calculate("input.txt", None))
 
 # 431282096438444 - too low
 # 472978148847396 - too low
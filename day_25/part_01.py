@@ -8,7 +8,8 @@ from time import sleep
 
 import graphviz
 
-from utility.main import every_line, pret, show
+from utility.cache import snapshots
+from utility.main import debug_only, every_line, parse_args, pret, show
 
 
 @dataclass(frozen=True, order=True)
@@ -24,12 +25,16 @@ class Edge:
     def copy(self):
         return Edge(self.name, self.a, self.b)
 
+# Module level rather than a lambda so a parsed Graph can be pickled
+def one() -> int:
+    return 1
+
 @dataclass
 class Graph:
     nodes: set[Node] = field(default_factory=set)
     edges: list[Edge] = field(default_factory=list)
     node_to_edges: defaultdict[Node, list[Edge]] = field(default_factory=lambda: defaultdict(list))
-    nodes_absorbed: defaultdict[Node, int] = field(default_factory=lambda: defaultdict(lambda: 1))
+    nodes_absorbed: defaultdict[Node, int] = field(default_factory=lambda: defaultdict(one))
 
     def find_min_cut(self, state):
         while len(self.nodes) > 20:
@@ -71,6 +76,7 @@ class Graph:
 class State:
     graph: Graph
 
+    @debug_only
     def viz(self):
         dot = graphviz.Graph(comment='Day 25!', format="png")
         for node in sorted(self.graph.nodes):
@@ -79,6 +85,7 @@ class State:
             dot.edge(edge.a.name, edge.b.name)
         show(dot.source, clear=True)
         dot.render('graph')
+        sleep(1)
 
 def parse_line(state: State, line: str, _idx: int) -> State:
     if matches := re.match(r"([a-z]+): ([a-z ]+)", line):
@@ -98,22 +105,29 @@ def parse_line(state: State, line: str, _idx: int) -> State:
     else:
         raise Exception(f"Cannot parse: {line}")
 
+def parse(filename: str) -> State:
+    state = State(Graph())
+    every_line(state, filename, [parse_line])
+    return state
+
 def calculate(filename: str):
     found = 0
     result = []
+    # find_min_cut contracts the graph, so every try needs a fresh copy
+    fresh = snapshots(parse, filename)
     while found != 3:
-        state = State(Graph())
-        every_line(state, filename, [parse_line])
+        state = fresh()
         # state.viz()
         found, result = state.graph.find_min_cut(state)
         state.viz()
-        sleep(1)
         print(found)
     return prod(result)
 
 
-# pret("Trial:", calculate("trial.txt"))
-pret("Input:", calculate("input.txt"))
+if __name__ == "__main__":
+    parse_args()
+    # pret("Trial:", calculate("trial.txt"))
+    pret("Input:", calculate("input.txt"))
 
 # 2+1+763 + 1+1+3+1+1+1+1+1 = 776
 
@@ -0,0 +1,164 @@
+import argparse
+import json
+import math
+import platform
+import statistics
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from utility.main import parse_args
+from utility.runner import ROOT, Part, discover, run_isolated, run_part
+
+# Run from the repo root:
+#   python -m utility.bench                      # everything, 5 repeats
+#   python -m utility.bench 5 23 -n 10 --save-baseline
+#   python -m utility.bench --baseline bench_baseline.json --threshold 0.2
+#
+# Each part runs over its trial*.txt and any input*.txt it has. Every repeat
+# runs in a fresh fork so peak RSS is per run and nothing is cached between
+# repeats.
+
+RESULTS = ROOT / "bench.json"
+BASELINE = ROOT / "bench_baseline.json"
+
+# == Stats ==
+
+@dataclass
+class Stats:
+    result: str
+    runs: int
+    min: float
+    median: float
+    p95: float
+    peak_rss: int
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+def stats(measurements) -> Stats:
+    walls = [m.wall for m in measurements]
+    return Stats(
+        result=str(measurements[0].result),
+        runs=len(walls),
+        min=min(walls),
+        median=statistics.median(walls),
+        p95=percentile(walls, 95),
+        peak_rss=max(m.peak_rss for m in measurements),
+    )
+
+# == Benchmarking ==
+
+def input_names(part: Part) -> list[str]:
+    day_dir = part.path.parent
+    return [p.name for p in sorted(day_dir.glob("trial*.txt")) + sorted(day_dir.glob("input*.txt"))]
+
+def key(part: Part, input_name: str) -> str:
+    return f"{part.label}:{input_name}"
+
+def bench(part: Part, input_name: str, repeat: int, timeout: float | None, isolate=True) -> Stats:
+    measurements = []
+    for _ in range(repeat):
+        if isolate:
+            measurements.append(run_isolated(part, input_name, timeout=timeout, quiet=True))
+        else:
+            measurements.append(run_part(part, input_name))
+    return stats(measurements)
+
+def bench_all(parts: list[Part], repeat: int, timeout: float | None, isolate=True) -> dict[str, Stats]:
+    results = {}
+    for part in parts:
+        for input_name in input_names(part):
+            try:
+                results[key(part, input_name)] = s = bench(part, input_name, repeat, timeout, isolate)
+            except (Exception, SystemExit) as e:
+                print(f"{key(part, input_name):<32} failed: {type(e).__name__}: {e}", flush=True)
+                continue
+            print(
+                f"{key(part, input_name):<32} min {s.min:8.4f}s  median {s.median:8.4f}s  "
+                f"p95 {s.p95:8.4f}s  rss {s.peak_rss / 1024:7.1f}MB",
+                flush=True)
+    return results
+
+# == Files ==
+
+def save_results(path: Path, results: dict[str, Stats], repeat: int):
+    path.write_text(json.dumps({
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "results": {k: asdict(v) for k, v in sorted(results.items())},
+    }, indent=2) + "\n")
+
+def load_results(path: Path) -> dict[str, Stats]:
+    data = json.loads(path.read_text())
+    return {k: Stats(**v) for k, v in data["results"].items()}
+
+# == Comparing ==
+# A part regresses if its median wall time or peak RSS grew by more than the
+# threshold. Tiny timings are all noise, so changes under min_delta seconds
+# never count.
+
+@dataclass
+class Change:
+    key: str
+    field: str
+    before: float | str
+    after: float | str
+
+    def __str__(self):
+        if isinstance(self.before, str) or isinstance(self.after, str):
+            return f"{self.key} {self.field}: {self.before} -> {self.after}"
+        ratio = self.after / self.before if self.before else math.inf
+        return f"{self.key} {self.field}: {self.before} -> {self.after} ({ratio:.2f}x)"
+
+def compare(baseline: dict[str, Stats], results: dict[str, Stats], threshold=0.1, min_delta=0.005) -> list[Change]:
+    regressions = []
+    for k in sorted(baseline.keys() & results.keys()):
+        before, after = baseline[k], results[k]
+        if after.median - before.median > max(min_delta, before.median * threshold):
+            regressions.append(Change(k, "median", before.median, after.median))
+        if after.peak_rss - before.peak_rss > before.peak_rss * threshold:
+            regressions.append(Change(k, "peak_rss", before.peak_rss, after.peak_rss))
+        if after.result != before.result:
+            regressions.append(Change(k, "result", before.result, after.result))
+    return regressions
+
+def show_comparison(baseline: dict[str, Stats], results: dict[str, Stats], regressions: list[Change]):
+    print()
+    for k in sorted(baseline.keys() & results.keys()):
+        before, after = baseline[k].median, results[k].median
+        change = f"{(after / before - 1) * 100:+7.1f}%" if before else "    new"
+        print(f"{k:<32} {before:8.4f}s -> {after:8.4f}s {change}")
+    for change in regressions:
+        print(f"REGRESSION {change}")
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description='Benchmark AoC solvers')
+    parser.add_argument('days', nargs='*', type=int)
+    parser.add_argument('-p', '--part', action='append', help="e.g. part_02b, can repeat")
+    parser.add_argument('-n', '--repeat', default=5, type=int)
+    parser.add_argument('-t', '--timeout', default=60.0, type=float, help="seconds per run")
+    parser.add_argument('-o', '--output', default=RESULTS, type=Path)
+    parser.add_argument('--baseline', default=BASELINE, type=Path)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--threshold', default=0.1, type=float, help="0.1 = 10%% slower is a regression")
+    parser.add_argument('--in-process', action='store_true', help="don't fork per run")
+    args, rest = parser.parse_known_args(argv)
+    parse_args(rest, solvers_after=True)
+
+    parts = [p for p in discover(days=args.days) if not args.part or p.name in args.part]
+    results = bench_all(parts, args.repeat, args.timeout, isolate=not args.in_process)
+    save_results(args.output, results, args.repeat)
+    if args.save_baseline:
+        save_results(args.baseline, results, args.repeat)
+    elif args.baseline.exists():
+        baseline = load_results(args.baseline)
+        regressions = compare(baseline, results, threshold=args.threshold)
+        show_comparison(baseline, results, regressions)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
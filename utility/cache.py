@@ -0,0 +1,191 @@
+import argparse
+import ast
+import functools
+import hashlib
+import pickle
+import sys
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+from utility import main as utility_main
+
+# Answers from the runner, saved on disk under a hash of everything that can
+# change them: the input's bytes, the solver's source and the source of every
+# utility module it imports (and those import, and so on). Change any of
+# those and it's a miss, so there's nothing to invalidate by hand.
+#
+#   python -m utility.runner 25            # computes, then stores
+#   python -m utility.runner 25            # instant
+#   python -m utility.runner 25 --no-cache # always recompute
+#   python -m utility.cache --clear
+#
+# Solvers can also keep their parsed State, see snapshot() below. Every store
+# evicts least recently used entries past its directory's budget.
+
+ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = ROOT / ".cache" / "results"
+MAX_BYTES = 64 * 1024 * 1024
+SNAPSHOT_DIR = ROOT / ".cache" / "states"
+SNAPSHOT_MAX_BYTES = 256 * 1024 * 1024
+
+# == Keys ==
+
+# Sources don't change under a running process, so each file is read once
+@functools.lru_cache(maxsize=None)
+def imports(path: Path) -> tuple[Path, ...]:
+    modules = []
+    for node in ast.walk(ast.parse(path.read_text())):
+        if isinstance(node, ast.ImportFrom) and node.module:
+            # `from utility import main` imports utility/main.py
+            names = [node.module, *(f"{node.module}.{alias.name}" for alias in node.names)]
+        elif isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        else:
+            continue
+        for name in names:
+            module = ROOT / (name.replace(".", "/") + ".py")
+            if name.split(".")[0] == "utility" and module.exists():
+                modules.append(module)
+    return tuple(modules)
+
+def dependencies(path: Path) -> list[Path]:
+    found: set[Path] = set()
+    todo = [path]
+    while todo:
+        for module in imports(todo.pop()):
+            if module not in found:
+                found.add(module)
+                todo.append(module)
+    return sorted(found)
+
+def key(solver: Path, input_path: Path) -> str:
+    digest = hashlib.sha256()
+    digest.update(f"python {sys.version_info[0]}.{sys.version_info[1]}\0".encode())
+    for path in [solver, *dependencies(solver)]:
+        digest.update(f"{path.relative_to(ROOT)}\0".encode())
+        digest.update(path.read_bytes())
+    digest.update(b"\0input\0")
+    digest.update(input_path.read_bytes())
+    return digest.hexdigest()
+
+# == Store ==
+
+MISS = object()
+
+def entry(k: str, directory: Path = CACHE_DIR) -> Path:
+    return directory / f"{k}.pickle"
+
+def lookup(k: str, directory: Path = CACHE_DIR) -> Any:
+    path = entry(k, directory)
+    try:
+        with open(path, "rb") as opened:
+            result = pickle.load(opened)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        # Missing, torn, or pickled by a module that isn't loaded now
+        return MISS
+    # Keep it fresh for eviction
+    path.touch()
+    return result
+
+def store(k: str, result: Any, max_bytes: int = MAX_BYTES, directory: Path = CACHE_DIR):
+    try:
+        data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+        return
+    store_bytes(k, data, max_bytes, directory)
+
+def store_bytes(k: str, data: bytes, max_bytes: int = MAX_BYTES, directory: Path = CACHE_DIR):
+    directory.mkdir(parents=True, exist_ok=True)
+    # Write then rename so a killed run never leaves half an entry
+    partial = entry(k, directory).with_suffix(".partial")
+    partial.write_bytes(data)
+    partial.replace(entry(k, directory))
+    evict(max_bytes, directory)
+
+def entries(directory: Path = CACHE_DIR) -> list[Path]:
+    if not directory.exists():
+        return []
+    return sorted(directory.glob("*.pickle"), key=lambda p: p.stat().st_mtime)
+
+def evict(max_bytes: int = MAX_BYTES, directory: Path = CACHE_DIR):
+    paths = entries(directory)
+    total = sum(p.stat().st_size for p in paths)
+    for path in paths:
+        if total <= max_bytes:
+            break
+        total -= path.stat().st_size
+        path.unlink(missing_ok=True)
+
+def clear(directory: Path = CACHE_DIR):
+    for path in entries(directory):
+        path.unlink(missing_ok=True)
+
+# == Snapshots ==
+# Split a solver into parse(filename) -> State and the solve, then
+#
+#   state = snapshot(parse, filename)
+#
+# parses once and after that loads the pickled State, keyed like answers
+# plus the parse function's name. Every call hands back a fresh copy, so the
+# solve can mutate it. A solve that needs a fresh State again and again
+# works out the key and reads the bytes once, then only unpickles:
+#
+#   fresh = snapshots(parse, filename)
+#   while ...:
+#       state = fresh()
+#
+# --no-snapshot on utility.main's parser always parses, and keeps the
+# pickled bytes in memory only.
+
+STATE = TypeVar('STATE')
+
+def snapshot(parse: Callable[[str], STATE], filename: str) -> STATE:
+    return snapshots(parse, filename)()
+
+def snapshots(parse: Callable[[str], STATE], filename: str) -> Callable[[], STATE]:
+    solver = Path(parse.__code__.co_filename).resolve()
+    k = None
+    if not utility_main.args.no_snapshot and solver.exists():
+        k = hashlib.sha256(
+            f"{key(solver, Path(filename).resolve())} {parse.__module__}.{parse.__qualname__}".encode()
+        ).hexdigest()
+        try:
+            data = entry(k, SNAPSHOT_DIR).read_bytes()
+            state = pickle.loads(data)
+            # Keep it fresh for eviction
+            entry(k, SNAPSHOT_DIR).touch()
+            return held(state, data)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Missing, torn, or pickled by a module that isn't loaded now
+            pass
+    state = parse(filename)
+    try:
+        data = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+        return lambda: parse(filename)
+    if k is not None:
+        store_bytes(k, data, SNAPSHOT_MAX_BYTES, SNAPSHOT_DIR)
+    return held(state, data)
+
+def held(state: STATE, data: bytes) -> Callable[[], STATE]:
+    # The state already in hand goes out first, the rest are unpickled
+    first = [state]
+
+    def fresh() -> STATE:
+        return first.pop() if first else pickle.loads(data)
+
+    return fresh
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description='Inspect the AoC result and state caches')
+    parser.add_argument('--clear', action='store_true')
+    args = parser.parse_args(argv)
+    for directory, max_bytes in [(CACHE_DIR, MAX_BYTES), (SNAPSHOT_DIR, SNAPSHOT_MAX_BYTES)]:
+        if args.clear:
+            clear(directory)
+        paths = entries(directory)
+        total = sum(p.stat().st_size for p in paths)
+        print(f"{len(paths)} entries, {total / 1024:.1f}kB of {max_bytes / 1024 / 1024:.0f}MB in {directory}")
+
+if __name__ == "__main__":
+    main()
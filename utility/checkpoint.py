@@ -0,0 +1,80 @@
+import hashlib
+import pickle
+import time
+from pathlib import Path
+from typing import Generic, TypeVar
+
+from utility import main as utility_main
+
+# Save a long search's progress now and then so a killed run can carry on
+# where it left off. A checkpoint belongs to a name, the module its classes
+# pickle under and an input file's bytes, not to the code, so fixing a typo
+# doesn't throw away hours of work. A script's classes live in __main__ and
+# the runner's in day_NN.part_NN, so the two keep separate checkpoints. If
+# the saved state no longer fits the code, the run says so and starts fresh,
+# or run with --no-resume.
+#
+#   with Checkpoint("day_05/part_02 lowest seed", filename, __name__) as saved:
+#       candidate = saved.resume(0)
+#       while ...:
+#           candidate += 1
+#           saved.tick(candidate)
+#
+# Only tick() at a point the state is whole, it's pickled there and then.
+# It only looks at the clock every `check` calls and only writes every
+# `every` seconds. Leaving the block with an exception, Ctrl-C included,
+# keeps the last save; finishing normally deletes it.
+
+CHECKPOINT_DIR = Path(__file__).resolve().parent.parent / ".cache" / "checkpoints"
+
+STATE = TypeVar('STATE')
+
+class Checkpoint(Generic[STATE]):
+    def __init__(self, name: str, filename: str, module: str, every: float = 30.0, check: int = 1000):
+        digest = hashlib.sha256(
+            name.encode() + b"\0" + module.encode() + b"\0" + Path(filename).read_bytes()
+        ).hexdigest()
+        slug = "".join(c if c.isalnum() else "_" for c in name)
+        self.path = CHECKPOINT_DIR / f"{slug}-{digest[:16]}.pickle"
+        self.every = every
+        self.check = check
+        self.calls = 0
+        self.saved_at = time.monotonic()
+
+    def resume(self, default: STATE) -> STATE:
+        if utility_main.args.no_resume or not self.path.exists():
+            return default
+        try:
+            with open(self.path, "rb") as opened:
+                state = pickle.load(opened)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            # Torn, or pickled by code that's changed since
+            print(f"Can't resume from {self.path.name} ({type(e).__name__}: {e}), starting fresh", flush=True)
+            return default
+        print(f"Resuming from {self.path.name}", flush=True)
+        return state
+
+    def tick(self, state: STATE):
+        self.calls += 1
+        if self.calls % self.check:
+            return
+        if time.monotonic() - self.saved_at >= self.every:
+            self.save(state)
+
+    def save(self, state: STATE):
+        CHECKPOINT_DIR.mkdir(parents=True, exist_ok=True)
+        # Write then rename so being killed mid-write keeps the last good one
+        partial = self.path.with_suffix(".partial")
+        with open(partial, "wb") as opened:
+            pickle.dump(state, opened, protocol=pickle.HIGHEST_PROTOCOL)
+        partial.replace(self.path)
+        self.saved_at = time.monotonic()
+
+    def __enter__(self) -> "Checkpoint[STATE]":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # The live state may be half way through a step, so a failed run
+        # keeps the last save rather than writing a new one
+        if exc_type is None:
+            self.path.unlink(missing_ok=True)
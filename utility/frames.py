@@ -0,0 +1,99 @@
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from utility import main as utility_main
+from utility.main import show
+
+# Draw viz frames on a background thread so the search doesn't wait for them.
+# The solver hands over a cheap snapshot (copies of whatever the drawing
+# reads and the search keeps changing) and render(*snapshot) -> str turns it
+# into text later. Only the newest frame waits to be drawn, so a slow render
+# drops frames rather than holding the loop up.
+#
+#   with FrameRecorder(self.render, interval=0.1) as frames:
+#       while searching:
+#           if frames.ready():
+#               frames.frame(set(seen), current)
+#
+# ready() is the cheap check: it's False while a frame is waiting or drawing
+# and for `interval` seconds after the last one, so snapshots are only copied
+# when they'll be used. Frames go to the terminal through show(), or with
+# out="some_dir" to some_dir/frame_00001.txt and on.
+#
+# Only with --viz, and never in release mode, does it start its thread. Any
+# other time ready() is always False, so module checks and timed runs that
+# pass through a recorder don't leave a thread running.
+
+class FrameRecorder:
+    def __init__(self, render: Callable[..., str], interval: float = 0.1, out: str | None = None):
+        self.render = render
+        self.interval = interval
+        self.out = Path(out) if out else None
+        self.frames = 0
+        self.dropped = 0
+        self.failed: BaseException | None = None
+        self.pending: tuple[Any, ...] | None = None
+        self.busy = False
+        self.next_at = 0.0
+        self.closed = False
+        self.live = utility_main.args.viz and not utility_main.RELEASE
+        self.wake = threading.Condition()
+        self.thread = threading.Thread(target=self.draw_frames, daemon=True)
+
+    def ready(self) -> bool:
+        if not self.live:
+            return False
+        return not self.busy and time.monotonic() >= self.next_at
+
+    def frame(self, *snapshot):
+        with self.wake:
+            if self.pending is not None:
+                self.dropped += 1
+            self.pending = snapshot
+            self.busy = True
+            self.wake.notify()
+
+    def draw_frames(self):
+        while True:
+            with self.wake:
+                while self.pending is None and not self.closed:
+                    self.wake.wait()
+                if self.pending is None:
+                    return
+                snapshot, self.pending = self.pending, None
+            try:
+                self.draw(self.render(*snapshot))
+            except Exception as e:
+                # Don't let a broken viz kill the run, say so at the end
+                self.failed = e
+            with self.wake:
+                self.busy = self.pending is not None
+                self.next_at = time.monotonic() + self.interval
+
+    def draw(self, text: str):
+        self.frames += 1
+        if self.out is None:
+            show(text, clear=True)
+        else:
+            self.out.mkdir(parents=True, exist_ok=True)
+            (self.out / f"frame_{self.frames:05d}.txt").write_text(text + "\n")
+
+    def close(self):
+        if not self.live:
+            return
+        with self.wake:
+            self.closed = True
+            self.wake.notify()
+        self.thread.join()
+        if self.failed is not None:
+            show(f"viz failed: {type(self.failed).__name__}: {self.failed}")
+
+    def __enter__(self) -> "FrameRecorder":
+        if self.live:
+            self.thread.start()
+        return self
+
+    def __exit__(self, *_):
+        self.close()
@@ -0,0 +1,501 @@
+import argparse
+import string
+import sys
+from pathlib import Path
+from random import Random
+from typing import Callable
+
+from utility.runner import ROOT
+
+# Synthetic inputs, one generator per day. Each takes a size and a seed and
+# returns the whole input as text; same size and seed, same text. What size
+# means depends on the day and is noted on each one (lines, grid side, ...).
+#
+#   python -m utility.gen 17 --size 500           # writes day_17/gen_500_0.txt
+#   python -m utility.gen 22 --size 5000 -o -     # to stdout
+#   python -m utility.runner 17 -i gen_500_0.txt
+
+Generator = Callable[[int, int], str]
+GENERATORS: dict[int, Generator] = {}
+
+def generator(day: int):
+    def register(fn: Generator) -> Generator:
+        GENERATORS[day] = fn
+        return fn
+    return register
+
+def lines(rows) -> str:
+    return "\n".join(rows) + "\n"
+
+def names(rng: Random, n: int, length: int, alphabet=string.ascii_lowercase, taken=()) -> list[str]:
+    if n > len(alphabet) ** length - len(taken):
+        raise ValueError(f"Not enough {length} letter names for {n}")
+    found = set(taken)
+    result = []
+    while len(result) < n:
+        name = "".join(rng.choice(alphabet) for _ in range(length))
+        if name not in found:
+            found.add(name)
+            result.append(name)
+    return result
+
+# == Days ==
+
+DIGIT_WORDS = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+
+@generator(1)
+def gen_01(size: int, seed: int) -> str:
+    # size: lines
+    rng = Random(seed)
+    rows = []
+    for _ in range(size):
+        chunks = [str(rng.randint(1, 9))]
+        for _ in range(rng.randint(1, 6)):
+            chunks.append(rng.choice([
+                str(rng.randint(1, 9)),
+                rng.choice(DIGIT_WORDS),
+                "".join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 5))),
+            ]))
+        rng.shuffle(chunks)
+        rows.append("".join(chunks))
+    return lines(rows)
+
+@generator(2)
+def gen_02(size: int, seed: int) -> str:
+    # size: games
+    rng = Random(seed)
+    rows = []
+    for game in range(1, size + 1):
+        rounds = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(["red", "green", "blue"], rng.randint(1, 3))
+            rounds.append(", ".join(f"{rng.randint(1, 20)} {color}" for color in colors))
+        rows.append(f"Game {game}: {'; '.join(rounds)}")
+    return lines(rows)
+
+@generator(3)
+def gen_03(size: int, seed: int) -> str:
+    # size: grid side
+    rng = Random(seed)
+    grid = [["."] * size for _ in range(size)]
+    for y in range(size):
+        x = rng.randint(0, 3)
+        while x < size - 3:
+            if rng.random() < 0.3:
+                grid[y][x] = rng.choice("*#+$/@%=&-")
+                x += 2
+            else:
+                number = str(rng.randint(1, 999))
+                grid[y][x:x + len(number)] = number
+                x += len(number) + 1
+            x += rng.randint(1, 4)
+    return lines("".join(row) for row in grid)
+
+@generator(4)
+def gen_04(size: int, seed: int) -> str:
+    # size: cards
+    rng = Random(seed)
+    width = len(str(size))
+    rows = []
+    for card in range(1, size + 1):
+        winners = rng.sample(range(1, 100), 10)
+        # Cards can only win copies of cards that exist
+        wins = rng.randint(0, min(10, size - card))
+        have = rng.sample(winners, wins) + rng.sample([n for n in range(1, 100) if n not in winners], 25 - wins)
+        rng.shuffle(have)
+        rows.append(
+            f"Card {card:>{width}}: {' '.join(f'{n:>2}' for n in winners)} | {' '.join(f'{n:>2}' for n in have)}")
+    return lines(rows)
+
+@generator(5)
+def gen_05(size: int, seed: int) -> str:
+    # size: range of seed numbers, 100 is like the trial, 4_000_000_000 like the real one
+    rng = Random(seed)
+    seeds = []
+    for _ in range(10):
+        start = rng.randrange(size)
+        seeds += [start, rng.randint(1, max(1, size // 20))]
+    rows = ["seeds: " + " ".join(str(n) for n in seeds)]
+    steps = ["seed", "soil", "fertilizer", "water", "light", "temperature", "humidity", "location"]
+    for frm, to in zip(steps, steps[1:]):
+        rows += ["", f"{frm}-to-{to} map:"]
+        cuts = sorted(rng.sample(range(1, size), min(size - 1, rng.randint(2, 8))))
+        bounds = [0] + cuts + [size]
+        ranges = list(zip(bounds, bounds[1:]))
+        targets = ranges[:]
+        rng.shuffle(targets)
+        for (src, end), (dst, _) in zip(ranges, targets):
+            rows.append(f"{dst} {src} {end - src}")
+    return lines(rows)
+
+@generator(7)
+def gen_07(size: int, seed: int) -> str:
+    # size: hands
+    rng = Random(seed)
+    return lines(
+        f"{''.join(rng.choices('23456789TJQKA', k=5))} {rng.randint(1, 1000)}"
+        for _ in range(size))
+
+@generator(8)
+def gen_08(size: int, seed: int) -> str:
+    # size: nodes. Six ghost loops of different lengths, the first from AAA
+    # to ZZZ. Both turns lead to the same node, so any instructions work.
+    rng = Random(seed)
+    directions = "".join(rng.choices("LR", k=rng.randint(50, 300)))
+    prefixes = names(rng, 5, 2, string.ascii_uppercase, {"AA", "ZZ"})
+    starts = ["AAA"] + [f"{p}A" for p in prefixes]
+    ends = ["ZZZ"] + [f"{p}Z" for p in prefixes]
+    upper, middle = string.ascii_uppercase, string.ascii_uppercase[1:-1]
+    inner = [
+        upper[n // 624] + upper[n // 24 % 26] + middle[n % 24]
+        for n in rng.sample(range(26 * 26 * 24), min(size, 26 * 26 * 24))]
+    rows = [directions, ""]
+    for start, end in zip(starts, ends):
+        length = rng.randint(1, max(1, len(inner) // len(starts)))
+        chain = [start] + [inner.pop() for _ in range(min(length, len(inner)))] + [end]
+        for here, there in zip(chain, chain[1:] + [chain[1]]):
+            rows.append(f"{here} = ({there}, {there})")
+    return lines(rows)
+
+@generator(9)
+def gen_09(size: int, seed: int) -> str:
+    # size: sequences, each of 21 terms from a random polynomial
+    rng = Random(seed)
+    rows = []
+    for _ in range(size):
+        coefficients = [rng.randint(-9, 9) for _ in range(rng.randint(1, 6))]
+        rows.append(" ".join(
+            str(sum(c * n ** p for p, c in enumerate(coefficients)))
+            for n in range(21)))
+    return lines(rows)
+
+PIPES = {
+    frozenset({(0, -1), (0, 1)}): "|",
+    frozenset({(-1, 0), (1, 0)}): "-",
+    frozenset({(0, -1), (1, 0)}): "L",
+    frozenset({(0, -1), (-1, 0)}): "J",
+    frozenset({(0, 1), (-1, 0)}): "7",
+    frozenset({(0, 1), (1, 0)}): "F",
+}
+
+@generator(10)
+def gen_10(size: int, seed: int) -> str:
+    # size: grid side. One big loop, top edge straight and bottom edge a
+    # random skyline so there is plenty of inside, plus junk pipes.
+    rng = Random(seed)
+    size = max(size, 5)
+    grid = [[rng.choice("|-LJ7F..") for _ in range(size)] for _ in range(size)]
+    levels = []
+    while len(levels) < size:
+        levels += [rng.randint(2, size - 1)] * rng.randint(1, 4)
+    levels = levels[:size]
+    path = [(x, 0) for x in range(size)]
+    previous = 0
+    for x in range(size - 1, -1, -1):
+        level = levels[x] if x > 0 else 0
+        step = 1 if level > previous else -1
+        path += [(x, y) for y in range(previous + step, level + step, step) if (x, y) != path[-1]]
+        if x > 0:
+            path.append((x - 1, level))
+        previous = level
+    path = path[:-1] if path[-1] == path[0] else path
+    for idx, (x, y) in enumerate(path):
+        before, after = path[idx - 1], path[(idx + 1) % len(path)]
+        grid[y][x] = PIPES[frozenset({(before[0] - x, before[1] - y), (after[0] - x, after[1] - y)})]
+    x, y = rng.choice(path)
+    grid[y][x] = "S"
+    on_path = set(path)
+    for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
+        # Junk that points at S would make it ambiguous
+        if 0 <= x + dx < size and 0 <= y + dy < size and (x + dx, y + dy) not in on_path:
+            grid[y + dy][x + dx] = "."
+    return lines("".join(row) for row in grid)
+
+@generator(11)
+def gen_11(size: int, seed: int) -> str:
+    # size: grid side
+    rng = Random(seed)
+    empty_rows = set(rng.sample(range(size), size // 10))
+    empty_cols = set(rng.sample(range(size), size // 10))
+    return lines(
+        "".join(
+            "#" if y not in empty_rows and x not in empty_cols and rng.random() < 0.03 else "."
+            for x in range(size))
+        for y in range(size))
+
+@generator(12)
+def gen_12(size: int, seed: int) -> str:
+    # size: records
+    rng = Random(seed)
+    rows = []
+    for _ in range(size):
+        springs = "".join(rng.choices("#.", k=rng.randint(5, 20))).strip(".") or "#"
+        groups = [str(len(run)) for run in springs.split(".") if run]
+        masked = "".join("?" if rng.random() < 0.5 else c for c in springs)
+        rows.append(f"{masked} {','.join(groups)}")
+    return lines(rows)
+
+def mirror(line: tuple[str, int], x: int, y: int, width: int, height: int) -> tuple[int, int] | None:
+    axis, at = line
+    x, y = (2 * at - 1 - x, y) if axis == "col" else (x, 2 * at - 1 - y)
+    return (x, y) if 0 <= x < width and 0 <= y < height else None
+
+def reflections(rows: list[str], smudges: int) -> list[tuple[str, int]]:
+    width, height = len(rows[0]), len(rows)
+    found = []
+    for line in [("col", n) for n in range(1, width)] + [("row", n) for n in range(1, height)]:
+        diff = 0
+        for y in range(height):
+            for x in range(width):
+                other = mirror(line, x, y, width, height)
+                if other is not None and rows[y][x] != rows[other[1]][other[0]]:
+                    diff += 1
+        if diff == smudges * 2:
+            found.append(line)
+    return found
+
+def smudged_pattern(rng: Random) -> list[str] | None:
+    # Cells are linked by xor constraints: the pattern mirrors about line a,
+    # and mirrors about line b once the smudge cell is flipped.
+    width, height = rng.randint(5, 17), rng.randint(5, 17)
+    lines_ = [("col", n) for n in range(1, width)] + [("row", n) for n in range(1, height)]
+    a, b = rng.sample(lines_, 2)
+    smudge = (rng.randrange(width), rng.randrange(height))
+    if mirror(a, *smudge, width, height) is None or mirror(b, *smudge, width, height) is None:
+        return None
+    parent: dict[tuple[int, int], tuple[tuple[int, int], int]] = {}
+    def find(cell):
+        parity = 0
+        while cell in parent:
+            cell, step = parent[cell]
+            parity ^= step
+        return cell, parity
+    def union(one, other, parity) -> bool:
+        (root_one, p_one), (root_other, p_other) = find(one), find(other)
+        if root_one == root_other:
+            return p_one ^ p_other == parity
+        parent[root_one] = (root_other, p_one ^ p_other ^ parity)
+        return True
+    for y in range(height):
+        for x in range(width):
+            for line, flip in ((a, False), (b, True)):
+                other = mirror(line, x, y, width, height)
+                parity = flip and smudge in ((x, y), other)
+                if other is not None and not union((x, y), other, parity):
+                    return None
+    values: dict[tuple[int, int], bool] = {}
+    rows = []
+    for y in range(height):
+        row = ""
+        for x in range(width):
+            root, parity = find((x, y))
+            values.setdefault(root, rng.random() < 0.5)
+            row += "#" if values[root] ^ parity else "."
+        rows.append(row)
+    # Random cells can mirror by accident, the real ones never do
+    if reflections(rows, 0) != [a] or reflections(rows, 1) != [b]:
+        return None
+    return rows
+
+@generator(13)
+def gen_13(size: int, seed: int) -> str:
+    # size: patterns, each with one reflection and one smudge that moves it
+    rng = Random(seed)
+    rows = []
+    while len(rows) < size:
+        if pattern := smudged_pattern(rng):
+            rows.append("\n".join(pattern))
+    return "\n\n".join(rows) + "\n"
+
+@generator(14)
+def gen_14(size: int, seed: int) -> str:
+    # size: grid side
+    rng = Random(seed)
+    return lines("".join(rng.choices("O#.", weights=[2, 1, 5], k=size)) for _ in range(size))
+
+@generator(15)
+def gen_15(size: int, seed: int) -> str:
+    # size: steps
+    rng = Random(seed)
+    labels = names(rng, max(1, size // 4), 3)
+    return "".join(",".join(
+        f"{label}={rng.randint(1, 9)}" if rng.random() < 0.7 else f"{label}-"
+        for label in rng.choices(labels, k=size))) + "\n"
+
+@generator(16)
+def gen_16(size: int, seed: int) -> str:
+    # size: grid side
+    rng = Random(seed)
+    return lines("".join(rng.choices(".\\/|-", weights=[40, 3, 3, 2, 2], k=size)) for _ in range(size))
+
+@generator(17)
+def gen_17(size: int, seed: int) -> str:
+    # size: grid side
+    rng = Random(seed)
+    return lines("".join(rng.choices("123456789", k=size)) for _ in range(size))
+
+@generator(19)
+def gen_19(size: int, seed: int) -> str:
+    # size: workflows, and twice as many parts. Workflows only send parts to
+    # ones after them, so nothing loops.
+    rng = Random(seed)
+    flows = ["in"] + names(rng, max(0, size - 1), 3, taken={"in"})
+    rows = []
+    for idx, flow in enumerate(flows):
+        later = flows[idx + 1:idx + 8] or ["A", "R"]
+        targets = later + ["A", "R"]
+        rules = [
+            f"{rng.choice('xmas')}{rng.choice('<>')}{rng.randint(1, 4000)}:{rng.choice(targets)}"
+            for _ in range(rng.randint(1, 4))]
+        rows.append(f"{flow}{{{','.join(rules + [rng.choice(targets)])}}}")
+    rows.append("")
+    for _ in range(size * 2):
+        rows.append("{" + ",".join(f"{trait}={rng.randint(1, 4000)}" for trait in "xmas") + "}")
+    return lines(rows)
+
+@generator(20)
+def gen_20(size: int, seed: int) -> str:
+    # size: counters. Like the real input: the broadcaster starts each
+    # 12 bit counter, each counter's conjunction feeds an inverter, and the
+    # inverters all feed rm, which feeds rx.
+    rng = Random(seed)
+    size = max(1, size)
+    taken = {"rm", "rx"}
+    length = 2 if size <= 40 else 3
+    heads, rows = [], []
+    for _ in range(size):
+        bits = names(rng, 12, length, taken=taken)
+        conj, inverter = names(rng, 2, length, taken=taken | set(bits))
+        taken |= {*bits, conj, inverter}
+        heads.append(bits[0])
+        pattern = rng.randint(2 ** 11, 2 ** 12 - 1) | 1
+        for idx, bit in enumerate(bits):
+            children = [bits[idx + 1]] if idx + 1 < len(bits) else []
+            if pattern >> idx & 1:
+                children.append(conj)
+            rows.append(f"%{bit} -> {', '.join(children)}")
+        fed_back = [bit for idx, bit in enumerate(bits) if not pattern >> idx & 1]
+        rows.append(f"&{conj} -> {', '.join([bits[0]] + fed_back + [inverter])}")
+        rows.append(f"&{inverter} -> rm")
+    rows.append("&rm -> rx")
+    rows.insert(0, f"broadcaster -> {', '.join(heads)}")
+    return lines(rows)
+
+@generator(21)
+def gen_21(size: int, seed: int) -> str:
+    # size: grid side, made odd so S is in the middle
+    rng = Random(seed)
+    size |= 1
+    grid = [["#" if rng.random() < 0.15 else "." for _ in range(size)] for _ in range(size)]
+    middle = size // 2
+    for i in range(size):
+        grid[middle][i] = grid[i][middle] = "."
+        grid[0][i] = grid[-1][i] = grid[i][0] = grid[i][-1] = "."
+    grid[middle][middle] = "S"
+    return lines("".join(row) for row in grid)
+
+@generator(22)
+def gen_22(size: int, seed: int) -> str:
+    # size: bricks, on a 10x10 footprint, spaced out so none overlap
+    rng = Random(seed)
+    rows = []
+    for idx in range(size):
+        x, y, z = rng.randint(0, 9), rng.randint(0, 9), 4 * idx + 1
+        end = [x, y, z]
+        axis = rng.randint(0, 2)
+        end[axis] = min(end[axis] + rng.randint(0, 3), 9 if axis < 2 else z + 3)
+        rows.append(f"{x},{y},{z}~{end[0]},{end[1]},{end[2]}")
+    rng.shuffle(rows)
+    return lines(rows)
+
+@generator(23)
+def gen_23(size: int, seed: int) -> str:
+    # size: junctions per side. Junctions sit on a lattice joined by corridors
+    # that always slope right or down, with some corridors walled off, so it
+    # starts at (1, 0) and ends at (width - 2, height - 1) like the real one.
+    rng = Random(seed)
+    size = max(size, 2)
+    gap = rng.randint(6, 12)
+    side = gap * (size - 1) + 3
+    grid = [["#"] * side for _ in range(side)]
+    spot = lambda i: 1 + gap * i
+    for j in range(size):
+        for i in range(size):
+            x, y = spot(i), spot(j)
+            grid[y][x] = "."
+            edge = (j == 0 or j == size - 1 or i == 0 or i == size - 1)
+            if i + 1 < size and (edge or rng.random() < 0.85):
+                for dx in range(1, gap):
+                    grid[y][x + dx] = ">" if dx in (1, gap - 1) else "."
+            if j + 1 < size and (edge or rng.random() < 0.85):
+                for dy in range(1, gap):
+                    grid[y + dy][x] = "v" if dy in (1, gap - 1) else "."
+    grid[0][1] = "."
+    grid[-1][-2] = "."
+    return lines("".join(row) for row in grid)
+
+@generator(24)
+def gen_24(size: int, seed: int) -> str:
+    # size: hailstones. All of them are on the path of one thrown rock.
+    rng = Random(seed)
+    rock = [rng.randint(200_000_000_000_000, 400_000_000_000_000) for _ in range(3)]
+    rock_speed = [rng.randint(-100, 100) for _ in range(3)]
+    times = rng.sample(range(100_000_000_000, 500_000_000_000), size)
+    rows = []
+    for t in times:
+        speed = [s + rng.randint(-300, 300) or 1 for s in rock_speed]
+        pos = [p + (rs - s) * t for p, rs, s in zip(rock, rock_speed, speed)]
+        rows.append(f"{pos[0]}, {pos[1]}, {pos[2]} @ {speed[0]}, {speed[1]}, {speed[2]}")
+    return lines(rows)
+
+@generator(25)
+def gen_25(size: int, seed: int) -> str:
+    # size: components. Two well connected halves joined by exactly 3 wires.
+    rng = Random(seed)
+    size = max(size, 8)
+    nodes = names(rng, size, 3)
+    halves = [nodes[:size // 2], nodes[size // 2:]]
+    edges = set()
+    for half in halves:
+        for idx, node in enumerate(half):
+            edges.add((node, half[(idx + 1) % len(half)]))
+            for other in rng.sample(half, 3):
+                if other != node:
+                    edges.add((node, other))
+    for a, b in zip(rng.sample(halves[0], 3), rng.sample(halves[1], 3)):
+        edges.add((a, b))
+    wired: dict[str, list[str]] = {}
+    seen = set()
+    for a, b in edges:
+        if (b, a) in seen or (a, b) in seen:
+            continue
+        seen.add((a, b))
+        wired.setdefault(a, []).append(b)
+    return lines(f"{node}: {' '.join(others)}" for node, others in wired.items())
+
+# == Writing ==
+
+def input_path(day: int, size: int, seed: int) -> Path:
+    return ROOT / f"day_{day:02d}" / f"gen_{size}_{seed}.txt"
+
+def write(day: int, size: int, seed: int = 0, path: Path | None = None) -> Path:
+    path = path or input_path(day, size, seed)
+    if not path.exists():
+        path.write_text(GENERATORS[day](size, seed))
+    return path
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description='Generate AoC inputs')
+    parser.add_argument('days', nargs='*', type=int, help="defaults to every day")
+    parser.add_argument('-s', '--size', default=100, type=int)
+    parser.add_argument('--seed', default=0, type=int)
+    parser.add_argument('-o', '--output', help="a file, or - for stdout. Defaults to day_NN/gen_SIZE_SEED.txt")
+    args = parser.parse_args(argv)
+    for day in args.days or sorted(GENERATORS):
+        if args.output == "-":
+            sys.stdout.write(GENERATORS[day](args.size, args.seed))
+        else:
+            print(write(day, args.size, args.seed, Path(args.output) if args.output else None))
+
+if __name__ == "__main__":
+    main()
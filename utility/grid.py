@@ -0,0 +1,138 @@
+from typing import Iterator
+
+from utility.main import check, read_lines
+
+# == Grid ==
+# A rectangular map of one-character cells kept in a flat bytearray. A cell is
+# a plain int, idx = y * width + x, so searches can keep cells in sets, dicts
+# and lists without building or hashing coordinate objects, and memory is one
+# byte per cell.
+#
+#   grid = Grid.from_file("input.txt")
+#   start = grid.find("S")
+#   for n in grid.neighbours(start):
+#       if grid[n] != "#": ...
+
+# Directions are ints too, clockwise from right, so turning is +1 / -1 mod 4
+RIGHT, DOWN, LEFT, UP = range(4)
+DX = (1, 0, -1, 0)
+DY = (0, 1, 0, -1)
+
+class Grid:
+    __slots__ = ("width", "height", "cells", "offsets")
+
+    def __init__(self, width: int, height: int, fill: str = "."):
+        self.width = width
+        self.height = height
+        self.cells = bytearray(fill.encode() * (width * height))
+        # idx + offsets[direction] is the next cell that way, if it's on the grid
+        self.offsets = (1, width, -1, -width)
+
+    @classmethod
+    def from_lines(cls, lines: list[str]) -> "Grid":
+        width = len(lines[0]) if lines else 0
+        for y, line in enumerate(lines):
+            if len(line) != width:
+                raise ValueError(f"Line {y} is {len(line)} wide, expected {width}")
+        grid = cls(width, len(lines))
+        grid.cells[:] = "".join(lines).encode()
+        return grid
+
+    @classmethod
+    def from_file(cls, file: str) -> "Grid":
+        return cls.from_lines([line for line in read_lines(file) if line])
+
+    # == Cells ==
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __getitem__(self, idx: int) -> str:
+        return chr(self.cells[idx])
+
+    def __setitem__(self, idx: int, char: str):
+        self.cells[idx] = ord(char)
+
+    def idx(self, x: int, y: int) -> int:
+        return y * self.width + x
+
+    def xy(self, idx: int) -> tuple[int, int]:
+        y, x = divmod(idx, self.width)
+        return x, y
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def find(self, char: str) -> int:
+        return self.cells.find(ord(char))
+
+    def find_all(self, char: str) -> list[int]:
+        code = ord(char)
+        return [idx for idx, cell in enumerate(self.cells) if cell == code]
+
+    # == Moving ==
+    # Only moving left or right can wrap onto another row, so that's the only
+    # place x needs working out.
+
+    def step(self, idx: int, direction: int) -> int:
+        # The next cell that way, or -1 off the edge
+        if direction == RIGHT:
+            return idx + 1 if (idx + 1) % self.width else -1
+        elif direction == LEFT:
+            return idx - 1 if idx % self.width else -1
+        moved = idx + self.offsets[direction]
+        return moved if 0 <= moved < len(self.cells) else -1
+
+    def neighbours(self, idx: int) -> Iterator[int]:
+        x = idx % self.width
+        if x + 1 < self.width:
+            yield idx + 1
+        if idx + self.width < len(self.cells):
+            yield idx + self.width
+        if x > 0:
+            yield idx - 1
+        if idx >= self.width:
+            yield idx - self.width
+
+    def open_neighbours(self, idx: int, wall: str = "#") -> Iterator[int]:
+        code, cells = ord(wall), self.cells
+        return (n for n in self.neighbours(idx) if cells[n] != code)
+
+    # == Views ==
+
+    def row(self, y: int) -> str:
+        return self.cells[y * self.width:(y + 1) * self.width].decode()
+
+    def column(self, x: int) -> str:
+        return self.cells[x::self.width].decode()
+
+    def rows(self) -> list[str]:
+        return [self.row(y) for y in range(self.height)]
+
+    def columns(self) -> list[str]:
+        return [self.column(x) for x in range(self.width)]
+
+    def __str__(self) -> str:
+        return "\n".join(self.rows())
+
+# == Self test ==
+# Run with `python -m utility.grid`
+
+def self_test():
+    grid = Grid.from_lines(["S.#", "..#"])
+    check(grid.find("S"), 0)
+    check(grid.find_all("#"), [2, 5])
+    check(grid.xy(4), (1, 1))
+    check(grid.idx(1, 1), 4)
+    check(sorted(grid.neighbours(0)), [1, 3])
+    check(sorted(grid.neighbours(4)), [1, 3, 5])
+    check(sorted(grid.open_neighbours(4)), [1, 3])
+    check([grid.step(2, d) for d in (RIGHT, DOWN, LEFT, UP)], [-1, 5, 1, -1])
+    check([grid.step(3, d) for d in (RIGHT, DOWN, LEFT, UP)], [4, -1, -1, 0])
+    check(grid.column(2), "##")
+    grid[4] = "O"
+    check(str(grid), "S.#\n.O#")
+
+if __name__ == "__main__":
+    self_test()
+    print("OK")
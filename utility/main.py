@@ -1,8 +1,9 @@
+import functools
+import os
 import sys
 from dataclasses import dataclass
 from typing import Any, Callable, Collection, Sequence, Tuple, TypeVar
 from collections.abc import Iterable
-from PIL import Image, ImageDraw
 
 # == Check ==
 # To replace assert and show nicer errors
@@ -23,16 +24,65 @@ def pret(str: str, item):
     print(str, item, flush=True)
     return item
 
-# == tlog ==
-# Log at a level and hide if needed
+# == Args ==
+# Parsed only when asked, so importing utility doesn't read sys.argv.
+# Solvers call parse_args() at the top of their __main__ block.
 import argparse
 parser = argparse.ArgumentParser(description='Do AoC')
 parser.add_argument('-l', '--log', default=999, type=int)
-args = parser.parse_args()
-def tlog(level: int, line: str, spaces="  "):
+parser.add_argument('-w', '--workers', default=None, type=int, help="processes for every_line_parallel, 1 to run in process")
+parser.add_argument('--no-snapshot', action='store_true', help="parse inputs even if a parsed snapshot is cached")
+parser.add_argument('--no-resume', action='store_true', help="ignore saved checkpoints and start long searches over")
+parser.add_argument('--profile', nargs='?', const=25, default=None, type=int, metavar='TOP', help="cProfile the run, print the top functions at exit")
+parser.add_argument('--sample', nargs='?', const=0.005, default=None, type=float, metavar='INTERVAL', help="sample the stack every INTERVAL CPU seconds, report hot lines")
+parser.add_argument('--sample-every', default=5.0, type=float, help="seconds between live --sample reports, 0 for none")
+parser.add_argument('--memory', nargs='?', const=10, default=None, type=int, metavar='TOP', help="tracemalloc the run, report the lines holding the most")
+parser.add_argument('--memory-every', default=1.0, type=float, help="seconds between --memory growth reports, 0 for none")
+parser.add_argument('--profile-out', default=None, help="where --profile or --sample writes collapsed stacks, profile.folded and sample.folded by default")
+parser.add_argument('--viz', action='store_true', help="draw FrameRecorder frames as the solver runs")
+parser.add_argument('--release', action='store_true', help="skip checks, hrange asserts, logging and viz (runner, bench and scale only, use AOC_RELEASE=1 for a solver)")
+args = parser.parse_args([])
+
+def parse_args(argv: list[str] | None = None, solvers_after: bool = False) -> argparse.Namespace:
+    # solvers_after: no solver has been imported yet, as in the runner
+    global args
+    args = parser.parse_args(argv)
+    if args.release and not RELEASE:
+        if not solvers_after:
+            parser.error("--release only reaches solvers imported after it, so it's for utility.runner, bench and scale; "
+                         "run a solver directly with AOC_RELEASE=1 or python -O")
+        release()
+    if args.profile is not None and args.sample is not None and args.profile_out is not None:
+        parser.error("--profile and --sample can't both write to one --profile-out, leave it off to get profile.folded and sample.folded")
+    if args.profile is not None:
+        from utility.profiling import start
+        start(args.profile, args.profile_out or "profile.folded")
+    if args.sample is not None:
+        from utility.profiling import start_sampling
+        start_sampling(args.sample, args.sample_every, 20, args.profile_out or "sample.folded")
+    if args.memory is not None:
+        from utility.profiling import start_memory
+        start_memory(args.memory, args.memory_every)
+    return args
+
+# == tlog ==
+# Log at a level and hide if needed. Nothing gets formatted unless the level
+# is on, so pass a format string and its arguments, tlog(2, "{} -> {}", a, b),
+# or a callable that builds the line, tlog(2, lambda: draw(grid)).
+# In a hot loop check logs(level) once up front and skip the calls entirely.
+# In release mode (see below) both do nothing.
+def logs(level: int) -> bool:
+    return level <= args.log
+
+def tlog(level: int, line: str | Callable[[], str], *fmt_args, spaces="  "):
     assert level > 0, "Don't log at zero, you can't turn it off."
-    if level <= args.log:
-        print(spaces * level, line, flush=True)
+    if level > args.log:
+        return
+    if callable(line):
+        line = line()
+    elif fmt_args:
+        line = line.format(*fmt_args)
+    print(spaces * level, line, flush=True)
 
 # == hrange ==
 # To replace range in a way that checks length is as expected and is inclusive
@@ -44,10 +94,57 @@ def hrange(first: int, last: int, length: int):
     assert len(r) == length, f"Length of hrange({first}, {last}) should be {length}, is {len(r)}."
     return r
 
-check(
-    act = len(hrange(1, 100, 100)),
-    exp = 100
-)
+# == Release ==
+# For timing runs: check() passes without comparing, hrange() is a bare
+# range, logs() is False, tlog() and anything marked @debug_only do nothing,
+# and FrameRecorder never asks for a frame. Arguments to check() are still
+# worked out, so keep expensive checks out of the solve.
+#
+#   AOC_RELEASE=1 python part_02.py           # or python -O part_02.py
+#   python -m utility.runner 12 --release
+#
+# Solvers bind these names when they're imported, so --release only reaches
+# the ones loaded after parse_args(), which the runner, bench and scale make
+# sure of and say so with solvers_after=True. A solver file run directly with
+# --release has already bound them and is told to use the environment
+# variable or -O instead.
+
+RELEASE = False
+
+def release_check(act, exp):
+    return True
+
+def release_hrange(first: int, last: int, length: int):
+    return range(first, last + 1)
+
+def release_logs(level: int) -> bool:
+    return False
+
+def release_tlog(level: int, line: str | Callable[[], str], *fmt_args, spaces="  "):
+    pass
+
+def release():
+    global RELEASE, check, hrange, logs, tlog
+    RELEASE = True
+    # Inherited by anything run from here, spawned workers included
+    os.environ["AOC_RELEASE"] = "1"
+    check, hrange, logs, tlog = release_check, release_hrange, release_logs, release_tlog
+
+def nothing(*_args, **_kwargs):
+    return None
+
+def debug_only(fn: Callable) -> Callable:
+    if RELEASE:
+        return nothing
+    @functools.wraps(fn)
+    def unless_released(*args, **kwargs):
+        if RELEASE:
+            return None
+        return fn(*args, **kwargs)
+    return unless_released
+
+if not __debug__ or os.environ.get("AOC_RELEASE", "") not in ("", "0"):
+    release()
 
 # == Every ==
 # Iterates over every item in the list and calls a fn state, item, idx -> state
@@ -81,6 +178,69 @@ def every_line(state: STATE, file: str, fns: list[StateFn[STATE, ITEM]], strip=T
                 state = fn(state, line, idx)
     return state
 
+# == Bulk lines ==
+# Read a file in one go and hand out its lines. Pass the list to several
+# every_line_bulk calls and the file is only opened and decoded once.
+
+def read_lines(file: str, strip=True) -> list[str]:
+    with open(file) as opened:
+        lines = opened.read().split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    if strip:
+        return [line.strip() for line in lines]
+    return lines
+
+def every_line_bulk(state: STATE, file: str | list[str], fns: list[StateFn[STATE, str]], strip=True) -> STATE:
+    lines = read_lines(file, strip) if isinstance(file, str) else file
+    if len(fns) == 1:
+        fn = fns[0]
+        for idx, line in enumerate(lines):
+            state = fn(state, line, idx)
+        return state
+    for idx, line in enumerate(lines):
+        for fn in fns:
+            state = fn(state, line, idx)
+    return state
+
+# Calls fn state, lines, idx -> state once per batch, idx being the index of
+# the batch's first line
+def every_batch(state: STATE, file: str | list[str], fn: StateFn[STATE, list[str]], size=1024, strip=True) -> STATE:
+    lines = read_lines(file, strip) if isinstance(file, str) else file
+    for idx in range(0, len(lines), size):
+        state = fn(state, lines[idx:idx + size], idx)
+    return state
+
+# == Parallel lines ==
+# For days where every line is worked out on its own. fn line -> result runs
+# across worker processes, then reduce state, result, idx -> state folds the
+# results back in file order, so the answer matches a plain every_line.
+# fn and what it returns have to pickle: module level functions and
+# dataclasses are fine, lambdas aren't. Files of one chunk or less, or
+# workers=1 (-w 1), skip the pool.
+# Workers are forked, since parts loaded by utility.runner can't be imported
+# by name in a spawned process. A fork only copies the calling thread, and
+# one holding a lock in another thread (a FrameRecorder, a MemoryTracer) can
+# hang the child, so with other threads alive this runs serially instead.
+
+RESULT = TypeVar('RESULT')
+
+def every_line_parallel(state: STATE, file: str | list[str], fn: Callable[[str], RESULT], reduce: StateFn[STATE, RESULT], strip=True, workers: int | None = None, chunk=64) -> STATE:
+    lines = read_lines(file, strip) if isinstance(file, str) else file
+    workers = workers or args.workers
+    import threading
+    if workers == 1 or len(lines) <= chunk or threading.active_count() > 1:
+        return every(state, [fn(line) for line in lines], [reduce])
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork")) as pool:
+        for idx, result in enumerate(pool.map(fn, lines, chunksize=chunk)):
+            state = reduce(state, result, idx)
+    return state
+
+def sum_(state: int, item: int, _idx: int) -> int:
+    return state + item
+
 @dataclass
 class NiceState:
     items: list
@@ -94,15 +254,39 @@ def ladd_(state: NiceState, item: str | int, _idx: int) -> NiceState:
     state.items.append(item)
     return state
 
-check(
-    act = every(state=NiceState(items=[]), items=['a', 'b', 'c'], fns=[add_, ladd_]),
-    exp = NiceState(items=['a', 0, 'a', 'b', 1, 'b', 'c', 2, 'c'])
-)
+# == Self test ==
+# Run with `python -m utility.main`
+
+def self_test():
+    check(
+        act = len(hrange(1, 100, 100)),
+        exp = 100
+    )
+
+    check(
+        act = every(state=NiceState(items=[]), items=['a', 'b', 'c'], fns=[add_, ladd_]),
+        exp = NiceState(items=['a', 0, 'a', 'b', 1, 'b', 'c', 2, 'c'])
+    )
 
-check(
-    act = every(state=NiceState(items=[]), items=hrange(4, 6, 3), fns=[add_, ladd_]),
-    exp = NiceState(items=[4, 0, 4, 5, 1, 5, 6, 2, 6])
-)
+    check(
+        act = every(state=NiceState(items=[]), items=hrange(4, 6, 3), fns=[add_, ladd_]),
+        exp = NiceState(items=[4, 0, 4, 5, 1, 5, 6, 2, 6])
+    )
+
+    check(
+        act = every_line_bulk(state=NiceState(items=[]), file=['a', 'b'], fns=[add_, ladd_]),
+        exp = NiceState(items=['a', 0, 'a', 'b', 1, 'b'])
+    )
+
+    check(
+        act = every_batch(state=NiceState(items=[]), file=['a', 'b', 'c'], fn=add_, size=2),
+        exp = NiceState(items=[['a', 'b'], 0, ['c'], 2])
+    )
+
+    check(
+        act = every_line_parallel(state=NiceState(items=[]), file=['a', 'b', 'c'], fn=str.upper, reduce=add_, workers=2, chunk=1),
+        exp = NiceState(items=['A', 0, 'B', 1, 'C', 2])
+    )
 
 # == eprint ==
 # To print to stderr
@@ -141,24 +325,97 @@ COLORS = {
     "B": "blue",
     "/": "gray"
 }
-def imagify(filename: str, grid: list[list[Any]], scale=5):
-    s = lambda x: x * scale
-    height = s(len(grid))
-    width = s(max([len(row) for row in grid]))
-    with Image.new("RGBA", (width, height), "magenta") as im:
+# A grid becomes one byte per cell, an index into a palette of the COLORS
+# above, which PIL turns into an image in one call and scales with a nearest
+# neighbour resize. Only cells with a second character, drawn as text on top,
+# cost a PIL call each. Rows that are plain strings are mapped with
+# bytes.translate without looking at cells one at a time.
+
+MAGENTA = 0
+
+def palette() -> tuple[list[int], bytes, dict[str, int]]:
+    from PIL import ImageColor
+    names = ["magenta", *dict.fromkeys(COLORS.values())]
+    rgb = [channel for name in names for channel in ImageColor.getrgb(name)[:3]]
+    index = {char: names.index(color) for char, color in COLORS.items()}
+    table = bytearray(256)
+    for char, i in index.items():
+        table[ord(char)] = i
+    return rgb, bytes(table), index
+
+def image(grid: list[list[Any]] | list[str], scale=5):
+    from PIL import Image, ImageDraw
+    rgb, table, index = palette()
+    width = max([len(row) for row in grid])
+    cells = bytearray(width * len(grid))
+    texts = []
+    for y, row in enumerate(grid):
+        line = row if isinstance(row, str) else "".join(str(cell) for cell in row)
+        if len(line) == len(row) and line.isascii():
+            cells[y * width:y * width + len(row)] = line.encode().translate(table)
+            continue
+        for x, cell in enumerate(row):
+            clr = str(cell)
+            if len(clr) > 1:
+                texts.append((x, y, clr[1]))
+            cells[y * width + x] = index.get(clr[:1], MAGENTA)
+    im = Image.frombytes("P", (width, len(grid)), bytes(cells))
+    im.putpalette(rgb)
+    if scale != 1:
+        im = im.resize((width * scale, len(grid) * scale), Image.Resampling.NEAREST)
+    if texts:
+        im = im.convert("RGB")
         draw = ImageDraw.Draw(im)
-        for y, row in enumerate(grid):
-            for x, cell in enumerate(row):
-                clr = str(cell)
-                text = None
-                if len(clr) > 1:
-                    text = clr[1]
-                    clr = clr[0]
-                color = COLORS.get(str(clr), "magenta")
-                draw.rectangle((s(x), s(y), s(x) + s(1), s(y) + s(1)), fill=color)
-                if text:
-                    draw.text((s(x), s(y)), text)
-        im.save(filename, "PNG")
+        for x, y, text in texts:
+            draw.text((x * scale, y * scale), text)
+    return im
+
+def imagify(filename: str, grid: list[list[Any]] | list[str], scale=5):
+    image(grid, scale).save(filename, "PNG")
+
+# == Animation ==
+# Collect a frame per imagify-style grid and write them all as an animated
+# GIF or APNG, picked by the file extension, when closed. PIL wants every
+# frame at once to write one, so at most `most` are kept: when that many
+# have piled up every other one goes and from then on only one frame in
+# twice as many is kept. However long the search, the frames stay spread
+# evenly over it and memory stays bounded.
+#
+#   with Animation("search.gif", scale=3) as animation:
+#       while searching:
+#           animation.add(grid)
+
+class Animation:
+    def __init__(self, filename: str, scale=5, duration=100, most=500):
+        self.filename = filename
+        self.scale = scale
+        self.duration = duration
+        self.most = most
+        self.stride = 1
+        self.added = 0
+        self.frames: list[Any] = []
+
+    def add(self, grid: list[list[Any]] | list[str]):
+        self.added += 1
+        if (self.added - 1) % self.stride:
+            return
+        self.frames.append(image(grid, self.scale))
+        if len(self.frames) >= self.most:
+            self.frames = self.frames[::2]
+            self.stride *= 2
+
+    def close(self):
+        if not self.frames:
+            return
+        first, *rest = self.frames
+        first.save(self.filename, save_all=True, append_images=rest, duration=self.duration, loop=0)
+        self.frames = []
+
+    def __enter__(self) -> "Animation":
+        return self
+
+    def __exit__(self, *_):
+        self.close()
 
 # imagify("try.png", [
 #     [".", "#"],
@@ -250,4 +507,6 @@ class C3:
 # #         random_tuple = (randint(0, 9), randint(0, 9), randint(0, 9))
 # #         chart.redraw([C3(random_tuple, "RRGGBB"), C3((1, 1, 1), "RRGGBB")])
 
-
+if __name__ == "__main__":
+    self_test()
+    print("OK")
@@ -0,0 +1,246 @@
+import atexit
+import cProfile
+import os
+import pstats
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from types import CodeType, FrameType
+
+# Started by utility.main.parse_args when a solver (or the runner) is given
+# --profile. It profiles everything after that point and at exit prints the
+# top functions by cumulative time to stderr and writes collapsed stacks that
+# flamegraph.pl, speedscope or inferno can read:
+#
+#   cd day_16 && python part_02.py --profile 40
+#   flamegraph.pl profile.folded > profile.svg
+#
+# --sample is the cheap alternative for runs that take minutes or never end.
+# A CPU timer interrupts the solver every few milliseconds and counts where it
+# is. A live top list goes to stderr every few seconds, and the totals plus
+# collapsed stacks come out at exit, Ctrl-C included, to sample.folded so
+# they don't overwrite --profile's:
+#
+#   cd day_20 && python part_02.py --sample --sample-every 10
+#
+# --memory traces allocations with tracemalloc and says which lines hold the
+# most memory, and how that grows as the run goes on:
+#
+#   cd day_05 && python part_02.py --memory 15 --memory-every 2
+
+# == cProfile ==
+
+_profiler: cProfile.Profile | None = None
+
+def start(top: int, out: str):
+    global _profiler
+    if _profiler is not None:
+        return
+    _profiler = cProfile.Profile()
+    # Solvers and the runner chdir about, so pin the output path now
+    atexit.register(finish, top, os.path.abspath(out))
+    _profiler.enable()
+
+def finish(top: int, out: str):
+    global _profiler
+    if _profiler is None:
+        return
+    _profiler.disable()
+    stats = pstats.Stats(_profiler, stream=sys.stderr)
+    _profiler = None
+    stats.sort_stats("cumulative").print_stats(top)
+    with open(out, "w") as opened:
+        opened.writelines(f"{';'.join(stack)} {count}\n" for stack, count in collapse(stats).items())
+    print(f"Collapsed stacks written to {out}", file=sys.stderr)
+
+# == Collapsed stacks ==
+# cProfile only keeps caller -> callee totals, not whole stacks, so stacks are
+# rebuilt by walking down from the roots and sharing each function's time
+# between its callers in proportion. That's exact for trees and a fair
+# estimate otherwise. Counts are microseconds.
+
+def label(func: tuple[str, int, str]) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+def collapse(stats: pstats.Stats, min_time=1e-6) -> dict[tuple[str, ...], int]:
+    raw = stats.stats  # type: ignore[attr-defined]
+    callees: dict[tuple, list[tuple]] = {func: [] for func in raw}
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller in callers:
+            if caller in callees:
+                callees[caller].append(func)
+    stacks: dict[tuple[str, ...], int] = {}
+
+    def walk(func, path: tuple, labels: tuple[str, ...], time_in: float):
+        _, _, own, total, _ = raw[func]
+        share = time_in / total if total else 0
+        count = round(own * share * 1e6)
+        if count > 0:
+            stacks[labels] = stacks.get(labels, 0) + count
+        for callee in callees[func]:
+            if callee in path:
+                continue
+            edge = raw[callee][4][func][3] * share
+            if edge >= min_time:
+                walk(callee, path + (callee,), labels + (label(callee),), edge)
+
+    for func, (_, _, _, total, callers) in raw.items():
+        # Skip the profiler's own disable() call
+        if func[0] == __file__:
+            continue
+        if not any(caller in raw for caller in callers):
+            walk(func, (func,), (label(func),), total)
+    return stacks
+
+# == Sampling ==
+# Each tick of ITIMER_PROF (CPU time, so sleeping isn't counted) runs sample()
+# between two bytecodes of the main thread, with the frame that was running.
+# It only bumps counters keyed by code objects; names are worked out when
+# reporting. At the default 5ms that costs well under 1%.
+
+class Sampler:
+    def __init__(self, interval: float, every: float, top: int, out: str):
+        self.interval = interval
+        self.every = every
+        self.top = top
+        self.out = out
+        self.samples = 0
+        self.lines: Counter[tuple[CodeType, int]] = Counter()
+        self.stacks: Counter[tuple[CodeType, ...]] = Counter()
+        self.started = self.reported = time.monotonic()
+
+    def start(self):
+        signal.signal(signal.SIGPROF, self.sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, signal.SIG_DFL)
+
+    def sample(self, _signum: int, frame: FrameType | None):
+        if frame is None:
+            return
+        self.samples += 1
+        self.lines[(frame.f_code, frame.f_lineno)] += 1
+        stack = []
+        while frame is not None:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        self.stacks[tuple(reversed(stack))] += 1
+        if self.every and time.monotonic() - self.reported >= self.every:
+            self.reported = time.monotonic()
+            self.report(self.top // 2 or 1)
+
+    def report(self, top: int):
+        elapsed = time.monotonic() - self.started
+        print(f"== {self.samples} samples, {elapsed:.1f}s ==", file=sys.stderr)
+        for (code, line), count in self.lines.most_common(top):
+            print(
+                f"{count:8} {count / self.samples:6.1%}  "
+                f"{code.co_name} ({os.path.basename(code.co_filename)}:{line})",
+                file=sys.stderr)
+        sys.stderr.flush()
+
+    def finish(self):
+        self.stop()
+        if not self.samples:
+            return
+        self.report(self.top)
+        with open(self.out, "w") as opened:
+            for stack, count in self.stacks.items():
+                labels = ";".join(label((code.co_filename, code.co_firstlineno, code.co_name)) for code in stack)
+                opened.write(f"{labels} {count}\n")
+        print(f"Collapsed stacks written to {self.out}", file=sys.stderr)
+
+_sampler: Sampler | None = None
+
+def start_sampling(interval: float, every: float, top: int, out: str):
+    global _sampler
+    if _sampler is not None:
+        return
+    _sampler = Sampler(interval, every, top, os.path.abspath(out))
+    atexit.register(_sampler.finish)
+    _sampler.start()
+
+# == Memory ==
+# A background thread snapshots the traced allocations every few seconds and
+# prints what grew since the last one. The biggest snapshot is kept, and at
+# exit its top lines are printed along with the exact traced peak. Snapshots
+# are only taken every so often, so the "at peak" sites are the ones at the
+# biggest snapshot, which can miss a short spike. Tracing makes everything a
+# few times slower, don't time a run with it on.
+
+IGNORED = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+def kb(size: int) -> str:
+    return f"{size / 1024:.1f}kB"
+
+class MemoryTracer:
+    def __init__(self, top: int, every: float):
+        self.top = top
+        self.every = every
+        self.started = time.monotonic()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.watch, daemon=True)
+        self.previous: tracemalloc.Snapshot | None = None
+        self.biggest: tracemalloc.Snapshot | None = None
+        self.biggest_size = 0
+
+    def start(self):
+        tracemalloc.start()
+        if self.every:
+            self.thread.start()
+
+    def snapshot(self) -> tracemalloc.Snapshot:
+        snapshot = tracemalloc.take_snapshot().filter_traces(IGNORED)
+        size = sum(stat.size for stat in snapshot.statistics("filename"))
+        if size >= self.biggest_size:
+            self.biggest, self.biggest_size = snapshot, size
+        return snapshot
+
+    def watch(self):
+        while not self.stopped.wait(self.every):
+            snapshot = self.snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            elapsed = time.monotonic() - self.started
+            print(f"== {elapsed:.1f}s traced {kb(current)}, peak {kb(peak)} ==", file=sys.stderr)
+            if self.previous is not None:
+                for stat in snapshot.compare_to(self.previous, "lineno")[:self.top // 2 or 1]:
+                    print(f"{kb(stat.size_diff):>12} {stat.count_diff:+9}  {stat.traceback}", file=sys.stderr)
+            sys.stderr.flush()
+            self.previous = snapshot
+
+    def finish(self):
+        self.stopped.set()
+        if self.thread.is_alive():
+            self.thread.join()
+        if not tracemalloc.is_tracing():
+            return
+        self.snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"== Traced peak {kb(peak)}, top lines at {kb(self.biggest_size)} ==", file=sys.stderr)
+        if self.biggest is not None:
+            for stat in self.biggest.statistics("lineno")[:self.top]:
+                print(f"{kb(stat.size):>12} {stat.count:9}  {stat.traceback}", file=sys.stderr)
+
+_tracer: MemoryTracer | None = None
+
+def start_memory(top: int, every: float):
+    global _tracer
+    if _tracer is not None:
+        return
+    _tracer = MemoryTracer(top, every)
+    atexit.register(_tracer.finish)
+    _tracer.start()
@@ -0,0 +1,66 @@
+from operator import attrgetter
+from typing import Any, Iterable, Sequence
+
+from utility.main import check
+
+# Text pictures of a grid for the viz() methods. Rather than asking every
+# cell which set it's in, start from a base and stamp each overlay's
+# positions on top:
+#
+#   render(self.width, self.height, [
+#       (self.best_path, "*"),
+#       (self.seen, "o"),
+#   ], base=self.rows)
+#
+# Layers read like an if/elif chain, the first one listing a position wins.
+# The base is a fill character or the rows themselves. Positions can be Vecs,
+# anything else with .x and .y, or (x, y) tuples, and ones off the grid are
+# left out. Everything is one bytearray with a newline after each row, so
+# glyphs and the base have to be ASCII.
+
+Layer = tuple[Iterable[Any], str]
+
+xy = attrgetter("x", "y")
+
+def coords(positions: Iterable[Any]) -> Iterable[tuple[int, int]]:
+    positions = list(positions)
+    if positions and hasattr(positions[0], "x"):
+        return map(xy, positions)
+    return positions
+
+def render(width: int, height: int, layers: Sequence[Layer], base: str | Sequence[str] = ".") -> str:
+    stride = width + 1
+    if isinstance(base, str):
+        if len(base) != 1:
+            raise ValueError(f"Base should be one character, not {base!r}")
+        cells = bytearray((base * width + "\n").encode() * height)
+    else:
+        if len(base) != height or any(len(row) != width for row in base):
+            raise ValueError(f"Base should be {height} rows of {width}")
+        cells = bytearray("".join(row + "\n" for row in base).encode())
+        if len(cells) != stride * height:
+            raise ValueError("Base should be ASCII")
+    # Last layer first, so earlier ones stamp over it
+    for positions, glyph in reversed(layers):
+        if len(glyph) != 1 or not glyph.isascii():
+            raise ValueError(f"Glyph should be one ASCII character, not {glyph!r}")
+        byte = ord(glyph)
+        for x, y in coords(positions):
+            if 0 <= x < width and 0 <= y < height:
+                cells[y * stride + x] = byte
+    return cells[:-1].decode()
+
+# == Self test ==
+# Run with `python -m utility.render`
+
+def self_test():
+    from utility.vec import Vec
+    check(render(3, 2, []), "...\n...")
+    check(render(3, 2, [({(0, 0), (2, 1)}, "#")]), "#..\n..#")
+    check(render(3, 2, [([Vec(1, 0)], "A"), ([Vec(1, 0), Vec(0, 1)], "B")]), ".A.\nB..")
+    check(render(2, 2, [([(5, 5), (-1, 0)], "#")], base="x"), "xx\nxx")
+    check(render(3, 2, [([(1, 1)], "*")], base=["abc", "def"]), "abc\nd*f")
+
+if __name__ == "__main__":
+    self_test()
+    print("OK")
@@ -0,0 +1,242 @@
+import argparse
+import importlib.util
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Collection
+
+from utility import cache, vec
+from utility.main import check, parse_args
+
+# Run from the repo root:
+#   python -m utility.runner            # every day, every part, on input.txt
+#   python -m utility.runner 17 23 -i trial.txt --isolate
+# Answers are cached by input and source (see utility.cache), --no-cache to
+# always recompute.
+# Anything not recognised here (e.g. -l) goes to utility.main.parse_args.
+
+ROOT = Path(__file__).resolve().parent.parent
+ENTRY_POINTS = ["calculate", "compute"]
+
+# == Parts ==
+# A part is one solver file: day_01/part_01.py, day_24/part_02b.py etc.
+
+@dataclass(frozen=True, order=True)
+class Part:
+    day: int
+    name: str
+    path: Path
+
+    @property
+    def label(self) -> str:
+        return f"day_{self.day:02d}/{self.name}"
+
+def discover(root: Path = ROOT, days: Collection[int] | None = None) -> list[Part]:
+    parts = []
+    for day_dir in sorted(root.glob("day_[0-9][0-9]")):
+        day = int(day_dir.name[4:])
+        if days and day not in days:
+            continue
+        for path in sorted(day_dir.glob("part_*.py")):
+            parts.append(Part(day, path.stem, path))
+    return parts
+
+@contextmanager
+def in_dir(path: Path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+# A part sees sys.argv as if it were run as a script with no arguments, so
+# one that parses sys.argv itself doesn't trip over the runner's flags.
+@contextmanager
+def as_script(part: Part):
+    previous = sys.argv
+    sys.argv = [str(part.path)]
+    try:
+        yield
+    finally:
+        sys.argv = previous
+
+# == Loading ==
+# Import a part without running it. Solvers only run their inputs under
+# `if __name__ == "__main__"`, so importing just defines things and runs the
+# checks. Registered as day_NN.part_NN so pickle can find its classes.
+
+_modules: dict[Part, ModuleType] = {}
+
+def load(part: Part) -> ModuleType:
+    if part not in _modules:
+        name = f"day_{part.day:02d}.{part.name}"
+        spec = importlib.util.spec_from_file_location(name, part.path)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"Can't load {part.path}")
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            with in_dir(part.path.parent), as_script(part):
+                spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+        _modules[part] = module
+    return _modules[part]
+
+def entry_point(module: ModuleType) -> Callable[[str], Any] | None:
+    for name in ENTRY_POINTS:
+        fn = getattr(module, name, None)
+        if callable(fn):
+            return fn
+    return None
+
+# == Measuring ==
+# Peak RSS is the process high-water mark (kB on Linux), so in one process it
+# only ever goes up. Use isolate=True to get a per-part figure. With trace=True
+# traced_peak is the most Python memory (bytes) held at once during the run,
+# which is exact but makes the run a lot slower, so don't trust its times.
+
+@dataclass
+class Measurement:
+    result: Any
+    wall: float
+    cpu: float
+    peak_rss: int
+    traced_peak: int = 0
+    cached: bool = False
+
+def peak_rss() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def measure(fn: Callable, *args, trace=False) -> Measurement:
+    if trace:
+        tracemalloc.start()
+    try:
+        wall, cpu = time.perf_counter(), time.process_time()
+        result = fn(*args)
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        traced = tracemalloc.get_traced_memory()[1] if trace else 0
+    finally:
+        if trace:
+            tracemalloc.stop()
+    return Measurement(result, wall, cpu, peak_rss(), traced)
+
+def run_part(part: Part, input_name: str = "input.txt", trace=False, use_cache=False) -> Measurement:
+    if use_cache:
+        wall = time.perf_counter()
+        k = cache.key(part.path, part.path.parent / input_name)
+        result = cache.lookup(k)
+        if result is not cache.MISS:
+            return Measurement(result, time.perf_counter() - wall, 0, peak_rss(), cached=True)
+    fn = entry_point(load(part))
+    if fn is None:
+        raise LookupError(f"{part.label} has no {' or '.join(ENTRY_POINTS)}")
+    try:
+        with in_dir(part.path.parent), as_script(part):
+            m = measure(fn, input_name, trace=trace)
+    finally:
+        # Shared Vecs from one part are no use to the next
+        vec.clear_interned()
+    if use_cache:
+        cache.store(k, m.result)
+    return m
+
+def run_isolated(part: Part, input_name: str = "input.txt", timeout: float | None = None, quiet=False, trace=False, use_cache=False) -> Measurement:
+    context = multiprocessing.get_context("fork")
+    receive, send = context.Pipe(duplex=False)
+    child = context.Process(target=_run_into, args=(send, part, input_name, quiet, trace, use_cache))
+    child.start()
+    send.close()
+    try:
+        if not receive.poll(timeout):
+            child.kill()
+            raise TimeoutError(f"{part.label} took longer than {timeout}s")
+        outcome = receive.recv()
+    except EOFError:
+        raise ChildProcessError(f"{part.label} died without a result") from None
+    finally:
+        child.join()
+    if isinstance(outcome, BaseException):
+        raise outcome
+    return outcome
+
+def _run_into(send, part: Part, input_name: str, quiet: bool, trace: bool, use_cache: bool):
+    try:
+        with open(os.devnull, "w") as devnull:
+            if quiet:
+                sys.stdout = sys.stderr = devnull
+            send.send(run_part(part, input_name, trace=trace, use_cache=use_cache))
+    except BaseException as e:
+        send.send(e)
+
+# == Report ==
+
+def format_rss(kb: int) -> str:
+    return f"{kb / 1024:.1f}MB"
+
+def report(part: Part, input_name: str, isolate=False, use_cache=False) -> Measurement | None:
+    if not (part.path.parent / input_name).exists():
+        print(f"{part.label:<16} skipped: no {input_name}", flush=True)
+        return None
+    try:
+        if isolate:
+            m = run_isolated(part, input_name, use_cache=use_cache)
+        else:
+            m = run_part(part, input_name, use_cache=use_cache)
+    except (Exception, SystemExit) as e:
+        print(f"{part.label:<16} failed: {type(e).__name__}: {e}", flush=True)
+        return None
+    print(
+        f"{part.label:<16} {str(m.result):<20} "
+        f"wall {m.wall:8.3f}s  cpu {m.cpu:8.3f}s  rss {format_rss(m.peak_rss):>9}"
+        f"{'  cached' if m.cached else ''}",
+        flush=True)
+    return m
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description='Run and time AoC solvers')
+    parser.add_argument('days', nargs='*', type=int)
+    parser.add_argument('-i', '--input', default="input.txt")
+    parser.add_argument('-p', '--part', action='append', help="e.g. part_02b, can repeat")
+    parser.add_argument('--isolate', action='store_true', help="run each part in a forked child")
+    parser.add_argument('--no-cache', action='store_true', help="recompute even if the answer is cached")
+    parser.add_argument('--self-test', action='store_true', help="check the runner can load and run parts, then exit")
+    args, rest = parser.parse_known_args(argv)
+    parse_args(rest, solvers_after=True)
+    if args.self_test:
+        self_test()
+        print("OK")
+        return
+    for part in discover(days=args.days):
+        if args.part and part.name not in args.part:
+            continue
+        report(part, args.input, isolate=args.isolate, use_cache=not args.no_cache)
+
+# == Self test ==
+# Run with `python -m utility.runner --self-test`. Finds, loads and runs a
+# quick part against its known trial answer, in process and forked, then
+# checks a part doesn't see the runner's own arguments.
+
+def self_test():
+    parts = discover(days=[1])
+    check([part.label for part in parts], ["day_01/part_01", "day_01/part_02"])
+    check(entry_point(load(parts[0])) is not None, True)
+    check(run_part(parts[0], "trial.txt").result, 142)
+    check(run_isolated(parts[0], "trial.txt", timeout=30, quiet=True).result, 142)
+    with tempfile.TemporaryDirectory() as scratch:
+        path = Path(scratch) / "part_01.py"
+        path.write_text("import sys\n\ndef calculate(filename):\n    return sys.argv\n")
+        check(run_part(Part(0, "part_01", path), "trial.txt").result, [str(path)])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import argparse
+import math
+from dataclasses import dataclass, field
+
+from utility.gen import GENERATORS, write
+from utility.main import parse_args
+from utility.runner import Part, discover, run_isolated
+
+# Runs one day over generated inputs of growing size and fits the empirical
+# exponent k in time ~ size^k (and the same for memory). Anything that grows
+# faster than it should is flagged.
+#
+#   python -m utility.scale 17 -p part_02 --start 10 --steps 6
+#   python -m utility.scale 25 --start 50 --factor 1.5 --timeout 120
+
+# What a sensible solution should manage, as (time, memory) exponents of
+# each generator's size. Grid days are size^2 because size is the side.
+EXPECTED: dict[int, tuple[float, float]] = {
+    1: (1, 1), 2: (1, 1), 3: (2, 2), 4: (1, 1), 5: (1, 1), 7: (1, 1),
+    8: (1, 1), 9: (1, 1), 10: (2, 2), 11: (4, 2), 12: (1, 1), 13: (1, 1),
+    14: (2, 2), 15: (1, 1), 16: (3, 2), 17: (2, 2), 19: (1, 1), 20: (1, 1),
+    21: (2, 2), 22: (2, 1), 23: (2, 2), 24: (2, 1), 25: (1, 1),
+}
+
+# Below these a run is mostly interpreter noise, so they're left out of fits
+MIN_WALL = 0.01
+MIN_TRACED = 64 * 1024
+
+# == Fitting ==
+
+def fit_exponent(points: list[tuple[float, float]]) -> float | None:
+    # Least squares slope of log(y) against log(size)
+    if len(points) < 2:
+        return None
+    xs = [math.log(x) for x, _ in points]
+    ys = [math.log(y) for _, y in points]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    if spread == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread
+
+def sizes(start: int, factor: float, steps: int) -> list[int]:
+    if factor <= 1:
+        # Sizes would never grow, so this would loop forever
+        raise ValueError(f"Factor should be more than 1, not {factor}")
+    result: list[int] = []
+    size = float(start)
+    while len(result) < steps:
+        if not result or round(size) > result[-1]:
+            result.append(round(size))
+        size *= factor
+    return result
+
+# == Curves ==
+
+@dataclass
+class Point:
+    size: int
+    wall: float
+    traced_peak: int
+
+@dataclass
+class Curve:
+    part: Part
+    points: list[Point] = field(default_factory=list)
+    stopped: str = ""
+
+    def time_exponent(self) -> float | None:
+        return fit_exponent([(p.size, p.wall) for p in self.points if p.wall >= MIN_WALL])
+
+    def memory_exponent(self) -> float | None:
+        return fit_exponent([(p.size, p.traced_peak) for p in self.points if p.traced_peak >= MIN_TRACED])
+
+def scale(part: Part, sizes: list[int], seed=0, timeout: float | None = 60, repeat=1) -> Curve:
+    curve = Curve(part)
+    for size in sizes:
+        input_name = write(part.day, size, seed).name
+        try:
+            walls = [
+                run_isolated(part, input_name, timeout=timeout, quiet=True).wall
+                for _ in range(repeat)]
+            traced = run_isolated(part, input_name, timeout=timeout * 10 if timeout else None, quiet=True, trace=True)
+        except (Exception, SystemExit) as e:
+            # Bigger only gets slower, so stop at the first failure
+            curve.stopped = f"size {size}: {type(e).__name__}: {e}"
+            break
+        curve.points.append(Point(size, min(walls), traced.traced_peak))
+        print(f"{part.label:<16} size {size:>8}  wall {min(walls):9.4f}s  traced {traced.traced_peak / 1024:10.1f}kB", flush=True)
+    return curve
+
+def verdict(exponent: float | None, expected: float, tolerance: float) -> str:
+    if exponent is None:
+        return "not enough data"
+    if exponent > expected + tolerance:
+        return f"WORSE THAN EXPECTED (~n^{expected:g})"
+    return "ok"
+
+def report(curve: Curve, tolerance: float):
+    expected_time, expected_memory = EXPECTED.get(curve.part.day, (1, 1))
+    time_exp, memory_exp = curve.time_exponent(), curve.memory_exponent()
+    show = lambda e: "   ?" if e is None else f"{e:4.2f}"
+    print(f"{curve.part.label:<16} time   ~ n^{show(time_exp)}  {verdict(time_exp, expected_time, tolerance)}")
+    print(f"{curve.part.label:<16} memory ~ n^{show(memory_exp)}  {verdict(memory_exp, expected_memory, tolerance)}")
+    if curve.stopped:
+        print(f"{curve.part.label:<16} stopped at {curve.stopped}")
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description='Fit how AoC solvers scale with input size')
+    parser.add_argument('day', type=int, choices=sorted(GENERATORS))
+    parser.add_argument('-p', '--part', action='append', help="e.g. part_02b, can repeat")
+    parser.add_argument('--start', default=10, type=int)
+    parser.add_argument('--factor', default=2.0, type=float)
+    parser.add_argument('--steps', default=6, type=int)
+    parser.add_argument('--seed', default=0, type=int)
+    parser.add_argument('-n', '--repeat', default=1, type=int, help="runs per size, the fastest counts")
+    parser.add_argument('-t', '--timeout', default=60.0, type=float, help="seconds per run")
+    parser.add_argument('--tolerance', default=0.3, type=float)
+    args, rest = parser.parse_known_args(argv)
+    if args.factor <= 1:
+        parser.error(f"--factor should be more than 1, not {args.factor}")
+    parse_args(rest, solvers_after=True)
+
+    curves = [
+        scale(part, sizes(args.start, args.factor, args.steps), args.seed, args.timeout, args.repeat)
+        for part in discover(days=[args.day])
+        if not args.part or part.name in args.part]
+    print()
+    for curve in curves:
+        report(curve, args.tolerance)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+import time
+from array import array
+from heapq import heappop, heappush
+from typing import Callable, Iterable, Iterator
+
+from utility.main import check, logs
+
+# == Search ==
+# Dijkstra, or A* given a heuristic, over states that are plain ints. Pack
+# whatever a state is (cell index, direction, steps taken, a visited bitmask)
+# into one int, and say where it can go and what that costs:
+#
+#   search = Search(moves, heuristic=to_end, size=cells * 4 * 11)
+#   goal = search.run([start], lambda state: state // 44 == end)
+#   search.cost(goal), search.path(goal)
+#
+# moves(state) gives (next_state, cost) pairs, costs are ints. With a size
+# every state is below, the best costs and parents live in flat int64 arrays,
+# otherwise in dicts that read like them.
+#
+# Nothing is ever looked for in the heap. An improved state is pushed again
+# and the old entry is skipped when it comes out (lazy deletion), so a search
+# is O(E log V). The heuristic has to be consistent for the first goal popped
+# to be the best. Without a goal it runs until the heap is empty, which with
+# negative costs finds longest paths as long as there are no cycles.
+#
+# After a run, expansions, elapsed and rate say how hard it worked. They're
+# logged at STATS, above the default --log, so ask with -l 1000 to see them.
+
+# Unreached, the most an array("q") holds
+INF = (1 << 63) - 1
+NO_PARENT = -1
+STATS = 1000
+
+class Costs(dict[int, int]):
+    # A dict that reads like the array it stands in for
+    def __missing__(self, _state: int) -> int:
+        return INF
+
+class Parents(dict[int, int]):
+    def __missing__(self, _state: int) -> int:
+        return NO_PARENT
+
+class Search:
+    def __init__(self, moves: Callable[[int], Iterable[tuple[int, int]]], heuristic: Callable[[int], int] | None = None, size: int | None = None):
+        self.moves = moves
+        self.heuristic = heuristic
+        self.size = size
+        self.expansions = 0
+        self.elapsed = 0.0
+        self.reset()
+
+    def reset(self):
+        if self.size is None:
+            self.costs: array[int] | Costs = Costs()
+            self.parents: array[int] | Parents = Parents()
+        else:
+            self.costs = array("q", [INF]) * self.size
+            self.parents = array("q", [NO_PARENT]) * self.size
+
+    def run(self, starts: Iterable[int], goal: Callable[[int], bool] | None = None, expanded: Callable[[int], None] | None = None) -> int | None:
+        costs, parents, moves = self.costs, self.parents, self.moves
+        heuristic = self.heuristic or (lambda _state: 0)
+        queue: list[tuple[int, int, int]] = []
+        for start in starts:
+            costs[start] = 0
+            heappush(queue, (heuristic(start), 0, start))
+        expansions = 0
+        began = time.perf_counter()
+        found = None
+        while queue:
+            _, cost, state = heappop(queue)
+            if cost > costs[state]:
+                # Beaten since it was pushed
+                continue
+            expansions += 1
+            if goal is not None and goal(state):
+                found = state
+                break
+            if expanded is not None:
+                expanded(state)
+            for next_state, step in moves(state):
+                next_cost = cost + step
+                if next_cost < costs[next_state]:
+                    costs[next_state] = next_cost
+                    parents[next_state] = state
+                    heappush(queue, (next_cost + heuristic(next_state), next_cost, next_state))
+        self.expansions += expansions
+        self.elapsed += time.perf_counter() - began
+        self.report()
+        return found
+
+    def report(self):
+        # Not tlog, which would indent it STATS levels deep
+        if logs(STATS):
+            print(f"{self.expansions} expansions in {self.elapsed:.3f}s, {self.rate:.0f}/s", flush=True)
+
+    @property
+    def rate(self) -> float:
+        return self.expansions / self.elapsed if self.elapsed else 0.0
+
+    def cost(self, state: int) -> int:
+        return self.costs[state]
+
+    def parent(self, state: int) -> int:
+        return self.parents[state]
+
+    def path(self, state: int) -> list[int]:
+        # Start first, state last
+        path = [state]
+        while (state := self.parent(state)) != NO_PARENT:
+            path.append(state)
+        return path[::-1]
+
+    def reached(self) -> Iterator[int]:
+        if isinstance(self.costs, Costs):
+            return iter(self.costs)
+        return (state for state, cost in enumerate(self.costs) if cost < INF)
+
+# == Dial ==
+# When every move costs a small whole number, a bucket per cost does the
+# heap's job in O(1): states wait in buckets[cost % (most + 1)] and the
+# buckets are swept in cost order. Nothing can land more than `most` ahead
+# of the bucket being swept, so that many buckets, plus one, go round.
+# Same costs, parents and stats as Search, no heuristic.
+#
+#   search = Dial(moves, size=cells * 2, most=90)
+
+class Dial(Search):
+    def __init__(self, moves: Callable[[int], Iterable[tuple[int, int]]], size: int | None = None, most: int = 9):
+        super().__init__(moves, size=size)
+        self.most = most
+
+    def run(self, starts: Iterable[int], goal: Callable[[int], bool] | None = None, expanded: Callable[[int], None] | None = None) -> int | None:
+        costs, parents, moves = self.costs, self.parents, self.moves
+        width = self.most + 1
+        buckets: list[list[int]] = [[] for _ in range(width)]
+        waiting = 0
+        for start in starts:
+            costs[start] = 0
+            buckets[0].append(start)
+            waiting += 1
+        expansions = 0
+        began = time.perf_counter()
+        found = None
+        cost = 0
+        while waiting and found is None:
+            bucket = buckets[cost % width]
+            while bucket:
+                state = bucket.pop()
+                waiting -= 1
+                if costs[state] != cost:
+                    # Beaten since it was put here
+                    continue
+                expansions += 1
+                if goal is not None and goal(state):
+                    found = state
+                    break
+                if expanded is not None:
+                    expanded(state)
+                for next_state, step in moves(state):
+                    next_cost = cost + step
+                    if next_cost < costs[next_state]:
+                        if step > self.most:
+                            raise ValueError(f"A move costs {step}, more than most={self.most}")
+                        costs[next_state] = next_cost
+                        parents[next_state] = state
+                        buckets[next_cost % width].append(next_state)
+                        waiting += 1
+            cost += 1
+        self.expansions += expansions
+        self.elapsed += time.perf_counter() - began
+        self.report()
+        return found
+
+# == Self test ==
+# Run with `python -m utility.search`
+
+def self_test():
+    # 0 -1-> 1 -1-> 3 and 0 -1-> 2 -1-> 3 tie, 1 comes out of the heap first
+    edges = {0: [(1, 1), (3, 5), (2, 1)], 1: [(3, 1)], 2: [(3, 1)], 3: []}
+    search = Search(lambda state: edges[state], size=4)
+    goal = search.run([0], lambda state: state == 3)
+    check(goal, 3)
+    check(search.cost(3), 2)
+    check(search.parent(0), NO_PARENT)
+    check(search.path(3), [0, 1, 3])
+    check(search.expansions, 4)
+    # No size, no goal: everything reachable
+    search = Search(lambda state: edges[state])
+    check(search.run([0]), None)
+    check(sorted(search.reached()), [0, 1, 2, 3])
+    check(search.cost(7), INF)
+    check(search.parent(7), NO_PARENT)
+    # Longest path with negative costs
+    search = Search(lambda state: [(n, -c) for n, c in edges[state]])
+    search.run([0])
+    check(search.cost(3), -5)
+    check(search.path(3), [0, 3])
+    # A heuristic that says 2 is close doesn't change the answer
+    search = Search(lambda state: edges[state], heuristic=lambda state: 0 if state in (2, 3) else 1, size=4)
+    check(search.run([0], lambda state: state == 3), 3)
+    check(search.cost(3), 2)
+    # Buckets agree with the heap
+    dial = Dial(lambda state: edges[state], size=4, most=5)
+    check(dial.run([0], lambda state: state == 3), 3)
+    check(dial.cost(3), 2)
+    check(len(dial.path(3)), 3)
+    dial = Dial(lambda state: edges[state], most=5)
+    check(dial.run([0]), None)
+    check({state: dial.cost(state) for state in dial.reached()}, {0: 0, 1: 1, 2: 1, 3: 2})
+
+if __name__ == "__main__":
+    self_test()
+    print("OK")
@@ -0,0 +1,154 @@
+from typing import Iterator
+
+from utility.main import check
+
+# == Vec ==
+# The 2D int coordinate most days used to define for themselves as a frozen
+# dataclass. Slotted, with the hash worked out once, so it's cheap to keep in
+# sets and dicts. Immutable like the dataclass was: assigning to one raises.
+#
+# Vec.of(x, y) hands back one shared instance per coordinate. neighbours() is
+# built from those and kept on the shared instance, whichever Vec asks, so a
+# search that keeps stepping around the same cells stops allocating once it
+# has seen them. adjacent() yields the same four without building a set.
+# The shared instances are one table for the whole process, so it starts
+# again past INTERN_LIMIT coordinates, and the runner clears it after every
+# part.
+
+# Packing puts (x, y) into one int, handy as a dict key or in a bytearray
+# index. Anything within +-2^31 round trips.
+BIAS = 1 << 31
+INTERN_LIMIT = 1 << 20
+
+def pack(x: int, y: int) -> int:
+    return ((y + BIAS) << 32) | (x + BIAS)
+
+def unpack(key: int) -> tuple[int, int]:
+    return (key & 0xFFFFFFFF) - BIAS, (key >> 32) - BIAS
+
+class Vec:
+    __slots__ = ("x", "y", "_hash", "_neighbours")
+
+    def __init__(self, x: int, y: int):
+        object.__setattr__(self, "x", x)
+        object.__setattr__(self, "y", y)
+        object.__setattr__(self, "_hash", hash((x, y)))
+        object.__setattr__(self, "_neighbours", None)
+
+    def __setattr__(self, name: str, value):
+        raise AttributeError(f"Vec is immutable, can't set {name}")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"Vec is immutable, can't delete {name}")
+
+    @staticmethod
+    def of(x: int, y: int) -> "Vec":
+        key = pack(x, y)
+        vec = _interned.get(key)
+        if vec is None:
+            if len(_interned) >= INTERN_LIMIT:
+                _interned.clear()
+            vec = _interned[key] = Vec(x, y)
+        return vec
+
+    @staticmethod
+    def unpacked(key: int) -> "Vec":
+        return Vec(*unpack(key))
+
+    def packed(self) -> int:
+        return pack(self.x, self.y)
+
+    # == Tuple-like ==
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not Vec:
+            return NotImplemented
+        return self.x == other.x and self.y == other.y
+
+    def __lt__(self, other: "Vec") -> bool:
+        return (self.x, self.y) < (other.x, other.y)
+
+    def __le__(self, other: "Vec") -> bool:
+        return (self.x, self.y) <= (other.x, other.y)
+
+    def __gt__(self, other: "Vec") -> bool:
+        return (self.x, self.y) > (other.x, other.y)
+
+    def __ge__(self, other: "Vec") -> bool:
+        return (self.x, self.y) >= (other.x, other.y)
+
+    def __iter__(self) -> Iterator[int]:
+        yield self.x
+        yield self.y
+
+    def __repr__(self) -> str:
+        return f"Vec(x={self.x}, y={self.y})"
+
+    def __reduce__(self):
+        return Vec, (self.x, self.y)
+
+    # == Maths ==
+
+    def add(self, other: "Vec") -> "Vec":
+        return Vec(self.x + other.x, self.y + other.y)
+
+    def sub(self, other: "Vec") -> "Vec":
+        return Vec(self.x - other.x, self.y - other.y)
+
+    def mdist(self, other: "Vec") -> int:
+        return abs(self.x - other.x) + abs(self.y - other.y)
+
+    hdist = mdist
+
+    def neighbours(self) -> frozenset["Vec"]:
+        # The four orthogonal neighbours. A frozenset so the days that did set
+        # maths on the old sets still can.
+        shared = Vec.of(self.x, self.y)
+        if shared._neighbours is None:
+            object.__setattr__(shared, "_neighbours", frozenset(shared.adjacent()))
+        return shared._neighbours
+
+    def adjacent(self) -> Iterator["Vec"]:
+        x, y = self.x, self.y
+        yield Vec.of(x, y - 1)
+        yield Vec.of(x + 1, y)
+        yield Vec.of(x, y + 1)
+        yield Vec.of(x - 1, y)
+
+    ortho = neighbours
+
+_interned: dict[int, Vec] = {}
+
+def clear_interned():
+    _interned.clear()
+
+# == Self test ==
+# Run with `python -m utility.vec`
+
+def self_test():
+    check(Vec(1, 2), Vec(x=1, y=2))
+    check(len({Vec(1, 2), Vec(1, 2), Vec(2, 1)}), 2)
+    check(Vec.of(3, 4) is Vec.of(3, 4), True)
+    check(Vec(4, 0).mdist(Vec(9, 10)), 15)
+    check(Vec(1, 1).add(Vec(-1, 2)), Vec(0, 3))
+    check(Vec(0, 0).neighbours(), {Vec(0, -1), Vec(1, 0), Vec(0, 1), Vec(-1, 0)})
+    check(Vec(0, 0).neighbours().difference({Vec(1, 0)}), {Vec(0, -1), Vec(0, 1), Vec(-1, 0)})
+    check(Vec(0, 0).neighbours() is Vec(0, 0).neighbours(), True)
+    check(list(Vec(0, 0).adjacent()), [Vec(0, -1), Vec(1, 0), Vec(0, 1), Vec(-1, 0)])
+    clear_interned()
+    check(len(_interned), 0)
+    check(sorted([Vec(2, 0), Vec(1, 5), Vec(1, 2)]), [Vec(1, 2), Vec(1, 5), Vec(2, 0)])
+    check(Vec.unpacked(Vec(-7, 12).packed()), Vec(-7, 12))
+    check(tuple(Vec(5, 6)), (5, 6))
+    try:
+        Vec(1, 2).x = 3
+        check("assigned", "AttributeError")
+    except AttributeError:
+        pass
+
+if __name__ == "__main__":
+    self_test()
+    print("OK")